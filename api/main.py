@@ -3,12 +3,17 @@ FastAPI application for Oasis
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import sys
 import os
+import json
+import time
 import logging
+import threading
 from datetime import datetime
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -21,7 +26,12 @@ logger = logging.getLogger(__name__)
 # Add the models directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from models.execution_config import configure_process
 from models.lstm_predictor import LSTMPredictor
+from models.model_registry import ModelRegistry
+from data.data_handler import DataHandler
+from api.training_queue import TrainingQueue, TrainingQueueFull
+from api.prediction_cache import PredictionCache
 
 app = FastAPI(
     title="Oasis API",
@@ -38,14 +48,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store trained models in memory
-trained_models = {}
+# Split this worker's share of the node's cores between /predict and background training
+execution_budget = configure_process('api')
+
+# Local market data store, refreshed hourly by the scheduler
+data_handler = DataHandler()
+
+# Trained models shared with the other workers through MODEL_DIR
+model_registry = ModelRegistry(data_handler=data_handler)
+
+# Background queue for fetch + train work so requests never block on training
+training_queue = TrainingQueue()
+
+# Field names of historical records in API responses
+HISTORICAL_FIELDS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+# Rows serialized per chunk when streaming /historical
+HISTORICAL_STREAM_CHUNK_ROWS = int(os.getenv('HISTORICAL_STREAM_CHUNK_ROWS', 500))
+
+# Recent predictions, reused until a new bar arrives or the model is retrained
+prediction_cache = PredictionCache()
+
+# Largest number of symbols accepted by /predict/batch
+BATCH_PREDICTION_MAX_ITEMS = int(os.getenv('BATCH_PREDICTION_MAX_ITEMS', 500))
+
+# Longest forecast horizon, in days, a multi-horizon model can be trained for
+MAX_PREDICTION_HORIZON = int(os.getenv('MAX_PREDICTION_HORIZON', 30))
+
+# Serve symbols covered by the global multi-symbol model (trained by the scheduler) from it
+GLOBAL_MODEL_ENABLED = os.getenv('GLOBAL_MODEL_ENABLED', 'False').lower() == 'true'
+
+# Saved models to load at boot: comma separated model keys (e.g. "TSLA_1y,BTC-USD_1y") or "all"
+WARM_START_MODELS = os.getenv('WARM_START_MODELS', '')
+
+# Load them while the app is imported, i.e. before gunicorn forks when preload_app is set;
+# otherwise they load in the background after startup and /health reports 503 until done.
+# TensorFlow is not fork-safe, so only the NumPy backend loads before the fork
+WARM_START_BLOCKING = os.getenv('WARM_START_BLOCKING', 'True').lower() == 'true'
+WARM_START_BEFORE_FORK = WARM_START_BLOCKING and os.getenv('INFERENCE_BACKEND', 'keras') == 'numpy'
+
+warm_start_state = {"status": "pending", "loaded": [], "failed": []}
+
+def warm_start():
+    """
+    Load the configured hot set of saved models into the registry
+    """
+    warm_start_state["status"] = "warming"
+    models = WARM_START_MODELS.strip()
+    if models:
+        model_keys = None if models.lower() == "all" else [key.strip() for key in models.split(',') if key.strip()]
+        logger.info(f"Warm start: preloading {models}")
+        loaded, failed = model_registry.preload(model_keys)
+        warm_start_state["loaded"] = loaded
+        warm_start_state["failed"] = failed
+    warm_start_state["status"] = "ready"
 
 class PredictionRequest(BaseModel):
     symbol: str
     type: str  # 'stock' or 'crypto'
     period: Optional[str] = "1y"
     epochs: Optional[int] = 30
+    horizon: Optional[int] = 1  # days predicted in one forward pass
 
 class PredictionResponse(BaseModel):
     symbol: str
@@ -55,6 +118,29 @@ class PredictionResponse(BaseModel):
     change_percent: float
     rmse: float
     mae: float
+    horizon: int = 1
+    predicted_path: Optional[List[float]] = None  # one price per day when horizon > 1
+
+class BatchPredictionItem(BaseModel):
+    symbol: str
+    period: Optional[str] = "1y"
+    horizon: Optional[int] = 1
+
+class BatchPredictionRequest(BaseModel):
+    items: List[BatchPredictionItem]
+    train_missing: Optional[bool] = True
+    epochs: Optional[int] = 30
+
+class BatchPredictionResult(BaseModel):
+    symbol: str
+    period: str
+    status: str  # 'ok', 'training' or 'error'
+    prediction: Optional[PredictionResponse] = None
+    job_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchPredictionResponse(BaseModel):
+    results: List[BatchPredictionResult]
 
 class HistoricalDataResponse(BaseModel):
     symbol: str
@@ -66,147 +152,507 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
+    """
+    Health check endpoint
+
+    Answers 503 while warm start is still loading models so load balancers
+    hold traffic until the hot set is in memory.
+    """
+    ready = warm_start_state["status"] == "ready"
+    content = {
+        "status": "healthy" if ready else "warming",
+        "ready": ready,
         "timestamp": datetime.now().isoformat(),
-        "service": "oasis-api"
+        "service": "oasis-api",
+        "models_loaded": len(model_registry.models),
+        "warm_start": {
+            "loaded": len(warm_start_state["loaded"]),
+            "failed": warm_start_state["failed"]
+        },
+        "threads": {
+            "training": execution_budget["training"],
+            "inference": execution_budget["inference"]
+        }
     }
+    if not ready:
+        return JSONResponse(status_code=503, content=content)
+    return content
 
-@app.post("/predict", response_model=PredictionResponse)
+def train_model(symbol, period, epochs, requested_at=None, mode="full", horizon=1):
+    """
+    Fetch data for a symbol, train or update its model and store it
+
+    Runs inside the training queue, never on the request path. Training
+    holds the key's cross-process training lock, so when several workers
+    queue the same key only one trains; the others wait for it, then find
+    the model it saved after their job was requested and load that model
+    instead of training a duplicate. With mode 'auto' or
+    'incremental' the saved model is fine-tuned on new bars instead of being
+    retrained from scratch (see LSTMPredictor.update). Mode 'search' first
+    runs a hyperparameter search and retrains with the winning configuration,
+    which is saved with the model and reused by later retrains.
+    """
+    with model_registry.training_lock(symbol, period, horizon):
+        return _train_model(symbol, period, epochs, requested_at, mode, horizon)
+
+def _train_model(symbol, period, epochs, requested_at, mode, horizon):
+    """Body of train_model, run while holding the key's training lock"""
+    model_key = ModelRegistry.make_key(symbol, period, horizon)
+    saved_version = model_registry.artifact_version(symbol, period, horizon)
+    if requested_at is not None and saved_version is not None and saved_version >= requested_at:
+        logger.info(f"Model {model_key} was trained by another worker, loading it")
+        prediction_cache.invalidate(model_key)
+        model_registry.get(symbol, period, horizon)
+        return {"symbol": symbol, "model_key": model_key}
+
+    # Warm start from a private copy of the saved model, if there is one
+    predictor = None
+    if mode not in ("full", "search"):
+        predictor, _ = model_registry.load_saved(symbol, period, horizon=horizon)
+    if predictor is None:
+        predictor = LSTMPredictor(symbol, period=period, model_dir=model_registry.model_dir, horizon=horizon)
+        predictor.load_config()
+
+    # Fetch data
+    logger.info(f"Fetching data for {symbol}")
+    if not predictor.fetch_data():
+        raise ValueError(f"Failed to fetch data for {symbol}")
+
+    if mode == "search":
+        from models.hyperparameter_search import search_hyperparameters
+        config, _ = search_hyperparameters(symbol, period, predictor.data, horizon=horizon)
+        predictor.config.update(config)
+        mode = "full"
+
+    # Train model
+    logger.info(f"Training model for {symbol} ({mode})")
+    action = predictor.update(mode=mode, epochs=epochs)
+
+    # Persist the trained model so every worker can serve it
+    if action != "none":
+        model_registry.put(predictor)
+        prediction_cache.invalidate(model_key)
+    logger.info(f"Model for {symbol} updated: {action}")
+    return {"symbol": symbol, "model_key": model_key, "update": action}
+
+def queue_training(symbol, period, epochs, mode="full", horizon=1):
+    """
+    Queue a training job; concurrent requests for the same key share one job
+
+    Returns:
+        tuple: (TrainingJob, created)
+    """
+    horizon_note = f", {horizon}-day horizon" if horizon > 1 else ""
+    return training_queue.submit(
+        ModelRegistry.make_key(symbol, period, horizon), train_model, symbol, period, epochs, time.time(), mode, horizon,
+        description=f"Train {symbol} ({period}, {epochs} epochs, {mode}{horizon_note})"
+    )
+
+def submit_training(symbol, period, epochs, mode="full", horizon=1):
+    """
+    Queue a training job and build the 202 response pointing at its status
+    """
+    try:
+        job, created = queue_training(symbol, period, epochs, mode, horizon)
+    except TrainingQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    message = f"Training started for {symbol}" if created else f"Training already in progress for {symbol}"
+    return JSONResponse(status_code=202, content={
+        "message": message,
+        "symbol": symbol,
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.job_id}"
+    })
+
+def validate_horizon(horizon):
+    """Check a requested forecast horizon and return it, defaulting to one day"""
+    horizon = horizon or 1
+    if not 1 <= horizon <= MAX_PREDICTION_HORIZON:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid horizon {horizon}, expected 1 to {MAX_PREDICTION_HORIZON} days"
+        )
+    return horizon
+
+def global_member(symbol, period, horizon=1):
+    """
+    Find the global model's per-symbol predictor for a symbol, if it serves it
+
+    The global model predicts one day ahead, so it never serves longer horizons.
+
+    Returns:
+        tuple: (GlobalLSTMPredictor, LSTMPredictor) or (None, None)
+    """
+    if not GLOBAL_MODEL_ENABLED or horizon != 1:
+        return None, None
+    global_model = model_registry.get_global(period)
+    if global_model is None or symbol not in global_model:
+        return None, None
+    member = global_model.predictors[symbol]
+    if member.data is None or member.data.empty:
+        return None, None
+    return global_model, member
+
+def prediction_cache_key(predictor):
+    """Cache key for a predictor's current prediction; the model key includes the horizon"""
+    return PredictionCache.make_key(predictor.model_key, predictor.trained_at, predictor.data.index[-1])
+
+def build_prediction(symbol, predictor, predicted):
+    """
+    Build a prediction response from predicted prices and the model's stored metrics
+
+    Args:
+        predicted: Next day price, or the price path of a multi-horizon model
+    """
+    path = np.atleast_1d(predicted)
+    next_day_price = float(path[0])
+    current_price = float(predictor.data['Close'].iloc[-1])
+    
+    # Calculate change
+    change = next_day_price - current_price
+    change_percent = (change / current_price) * 100
+    
+    # Metrics were computed when the model was trained
+    metrics = predictor.get_metrics()
+    
+    return PredictionResponse(
+        symbol=symbol,
+        current_price=current_price,
+        predicted_price=float(next_day_price),
+        change=float(change),
+        change_percent=float(change_percent),
+        rmse=float(metrics['rmse']),
+        mae=float(metrics['mae']),
+        horizon=len(path),
+        predicted_path=[float(price) for price in path] if len(path) > 1 else None
+    )
+
+@app.post("/predict", response_model=PredictionResponse, responses={202: {"description": "Training job queued"}})
 def predict_price(request: PredictionRequest):
     """
     Predict the next day's price for a given symbol
+
+    With horizon > 1 a model trained for that horizon returns the whole price
+    path in one forward pass as predicted_path; predicted_price is its first day.
+
+    Untrained symbols are queued for training and answered with 202 and a job id
+    to poll at /jobs/{job_id}; retry the prediction once the job has completed.
     """
     try:
         logger.info(f"Predicting price for {request.symbol}")
         
         # Create a unique key for the model
-        model_key = f"{request.symbol}_{request.period}"
+        period = request.period or "1y"
+        horizon = validate_horizon(request.horizon)
+        model_key = ModelRegistry.make_key(request.symbol, period, horizon)
         
-        # Check if we already have a trained model
-        if model_key not in trained_models:
-            logger.info(f"Creating new model for {request.symbol}")
-            # Create and train a new model
-            predictor = LSTMPredictor(request.symbol, period=request.period or "1y")
-            
-            # Fetch data
-            logger.info(f"Fetching data for {request.symbol}")
-            if not predictor.fetch_data():
-                logger.error(f"Failed to fetch data for {request.symbol}")
-                raise HTTPException(status_code=400, detail=f"Failed to fetch data for {request.symbol}")
-            
-            # Train model
-            logger.info(f"Training model for {request.symbol}")
-            predictor.train(epochs=request.epochs or 30)
-            
-            # Store the trained model
-            trained_models[model_key] = predictor
-        else:
-            # Use the existing trained model
-            logger.info(f"Using existing model for {request.symbol}")
-            predictor = trained_models[model_key]
+        # Serve from the resident global model when it covers the symbol, otherwise
+        # check if we already have a trained model, here or saved by another worker
+        global_model, predictor = global_member(request.symbol, period, horizon)
+        if predictor is None:
+            predictor = model_registry.get(request.symbol, period, horizon)
+        if predictor is None:
+            logger.info(f"No trained model for {model_key}, queueing training")
+            return submit_training(request.symbol, period, request.epochs or 30, horizon=horizon)
+
+        # Use the existing trained model
+        logger.info(f"Using existing {'global' if global_model else 'symbol'} model for {model_key}")
         
-        # Get current price
         if predictor.data is None or predictor.data.empty:
             logger.error(f"No data available for prediction for {request.symbol}")
             raise HTTPException(status_code=500, detail="No data available for prediction")
-        current_price = float(predictor.data['Close'].iloc[-1])
-        
-        # Predict next day
-        logger.info(f"Predicting next day price for {request.symbol}")
-        next_day_price = predictor.predict_next_day()
         
-        # Calculate change
-        change = next_day_price - current_price
-        change_percent = (change / current_price) * 100
+        # Reuse the prediction while the model and its latest bar are unchanged
+        cache_key = prediction_cache_key(predictor)
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Serving cached prediction for {model_key}")
+            return cached
         
-        # Evaluate model
-        logger.info(f"Evaluating model for {request.symbol}")
-        metrics = predictor.evaluate_model()
+        # Predict the next day, or the whole horizon in one forward pass
+        logger.info(f"Predicting {horizon}-day price path for {request.symbol}")
+        if global_model is not None:
+            predicted = global_model.predict_next_day(request.symbol)
+        else:
+            predicted = predictor.predict_path()
+        response = build_prediction(request.symbol, predictor, predicted)
         
         logger.info(f"Prediction completed for {request.symbol}")
-        return PredictionResponse(
-            symbol=request.symbol,
-            current_price=current_price,
-            predicted_price=float(next_day_price),
-            change=float(change),
-            change_percent=float(change_percent),
-            rmse=float(metrics['rmse']),
-            mae=float(metrics['mae'])
-        )
+        prediction_cache.set(cache_key, response)
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction failed for {request.symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_batch(request: BatchPredictionRequest):
+    """
+    Predict the next day's price for many symbols in one request
+
+    Cached predictions are returned as is; the remaining windows are stacked
+    per model and predicted in one call each. Untrained symbols are queued for
+    training (unless train_missing is false) and reported with their job id.
+    Each symbol gets its own result, so one failure never fails the batch.
+    """
+    if len(request.items) > BATCH_PREDICTION_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(request.items)} items, at most {BATCH_PREDICTION_MAX_ITEMS} allowed"
+        )
+    
+    logger.info(f"Batch predicting {len(request.items)} symbols")
+    results = {}  # model_key -> BatchPredictionResult
+    pending = {}  # model_key -> (symbol, period, predictor) still needing inference
+    
+    for item in request.items:
+        period = item.period or "1y"
+        horizon = item.horizon or 1
+        model_key = ModelRegistry.make_key(item.symbol, period, horizon)
+        if model_key in results or model_key in pending:
+            continue
+        
+        try:
+            validate_horizon(horizon)
+            global_model, predictor = global_member(item.symbol, period, horizon)
+            if predictor is None:
+                predictor = model_registry.get(item.symbol, period, horizon)
+            if predictor is None:
+                if not request.train_missing:
+                    results[model_key] = BatchPredictionResult(
+                        symbol=item.symbol, period=period, status="error", error="No trained model"
+                    )
+                    continue
+                job, _ = queue_training(item.symbol, period, request.epochs or 30, horizon=horizon)
+                results[model_key] = BatchPredictionResult(
+                    symbol=item.symbol, period=period, status="training", job_id=job.job_id
+                )
+                continue
+            
+            if predictor.data is None or predictor.data.empty:
+                raise ValueError("No data available for prediction")
+            
+            cached = prediction_cache.get(prediction_cache_key(predictor))
+            if cached is not None:
+                results[model_key] = BatchPredictionResult(
+                    symbol=item.symbol, period=period, status="ok", prediction=cached
+                )
+                continue
+            
+            pending[model_key] = (item.symbol, period, predictor, global_model)
+        except HTTPException as e:
+            results[model_key] = BatchPredictionResult(
+                symbol=item.symbol, period=period, status="error", error=e.detail
+            )
+        except Exception as e:
+            logger.error(f"Batch prediction failed for {model_key}: {str(e)}")
+            results[model_key] = BatchPredictionResult(
+                symbol=item.symbol, period=period, status="error", error=str(e)
+            )
+    
+    # Stack the windows of each model and predict them in a single call; every
+    # symbol served by the global model shares one call. Multi-horizon models
+    # return a price path per window.
+    groups = {}
+    for model_key, (symbol, period, predictor, global_model) in pending.items():
+        groups.setdefault(id(global_model or predictor), []).append(model_key)
+    
+    for model_keys in groups.values():
+        _, _, predictor, global_model = pending[model_keys[0]]
+        try:
+            if global_model is not None:
+                prices = global_model.predict_symbols([pending[model_key][0] for model_key in model_keys])
+            else:
+                windows = np.stack([pending[model_key][2].last_window() for model_key in model_keys])
+                prices = predictor.predict_windows(windows)
+        except Exception as e:
+            logger.error(f"Batch inference failed for {', '.join(model_keys)}: {str(e)}")
+            for model_key in model_keys:
+                symbol, period, _, _ = pending[model_key]
+                results[model_key] = BatchPredictionResult(
+                    symbol=symbol, period=period, status="error", error=str(e)
+                )
+            continue
+        
+        for model_key, price in zip(model_keys, prices):
+            symbol, period, member, _ = pending[model_key]
+            response = build_prediction(symbol, member, price)
+            prediction_cache.set(prediction_cache_key(member), response)
+            results[model_key] = BatchPredictionResult(
+                symbol=symbol, period=period, status="ok", prediction=response
+            )
+    
+    # Answer in request order
+    ordered = []
+    for item in request.items:
+        model_key = ModelRegistry.make_key(item.symbol, item.period or "1y", item.horizon or 1)
+        if model_key in results:
+            ordered.append(results.pop(model_key))
+    
+    logger.info(f"Batch prediction completed for {len(ordered)} models")
+    return BatchPredictionResponse(results=ordered)
+
+@app.get("/jobs/{job_id}")
+def get_job_status(job_id: str):
+    """
+    Get the status and result of a background training job
+
+    Any worker can answer for any job. If the worker running a job exited
+    before recording its outcome, the job counts as completed when a model
+    was saved for its key after it was queued, and as failed otherwise.
+    """
+    job = training_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+
+    status = job.to_dict()
+    if job.orphaned:
+        saved_version = model_registry.artifact_version(*ModelRegistry.parse_key(job.model_key))
+        if saved_version is not None and saved_version >= job.created_at.timestamp():
+            status.update({"status": "completed", "result": {"model_key": job.model_key}})
+        else:
+            status.update({"status": "failed", "error": "Training worker exited before the job finished"})
+    return status
+
+def historical_record(row):
+    """Turn a (date, open, high, low, close, volume) row into an API record"""
+    return dict(zip(HISTORICAL_FIELDS, row))
+
+def stream_historical(symbol, rows, fmt):
+    """
+    Serialize historical rows incrementally
+
+    'ndjson' emits one record per line; 'json-stream' emits the same document
+    as the buffered response, written a chunk of rows at a time.
+    """
+    chunk = []
+    if fmt == "json-stream":
+        yield '{"symbol": ' + json.dumps(symbol) + ', "data": ['
+    
+    separator = ""
+    for row in rows:
+        if fmt == "ndjson":
+            chunk.append(json.dumps(historical_record(row)) + "\n")
+        else:
+            chunk.append(separator + json.dumps(historical_record(row)))
+            separator = ", "
+        if len(chunk) >= HISTORICAL_STREAM_CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    
+    if chunk:
+        yield "".join(chunk)
+    if fmt == "json-stream":
+        yield "]}"
+
+def parse_date_param(name, value):
+    """Validate an optional YYYY-MM-DD query parameter"""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} date {value}, expected YYYY-MM-DD")
+
 @app.get("/historical")
-def get_historical_data(symbol: str, range: str = "1y"):
+def get_historical_data(symbol: str, range: str = "1y", type: str = "stock",
+                        start: Optional[str] = None, end: Optional[str] = None,
+                        format: str = "json"):
     """
     Get historical price data for a given symbol
+
+    Served from the local market data store; only ranges that were never
+    fetched before go upstream, and they are stored for the next request.
+
+    start/end (YYYY-MM-DD) narrow the range so long histories can be paged.
+    format=ndjson or format=json-stream streams rows straight from the
+    database cursor instead of building the whole response in memory.
     """
     try:
         logger.info(f"Fetching historical data for {symbol} with range {range}")
         
-        # Create predictor
-        predictor = LSTMPredictor(symbol, period=range)
+        if format not in ("json", "ndjson", "json-stream"):
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+        
+        data_type = "crypto" if type == "crypto" else "stock"
+        start = parse_date_param("start", start)
+        end = parse_date_param("end", end)
+        try:
+            start_date, end_date = data_handler.period_range(range, start, end)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if format != "json":
+            # Fill gaps before the response starts; errors can't be reported mid-stream
+            data_handler.ensure_coverage(symbol, start_date, end_date, data_type)
+            rows = data_handler.iter_historical_rows(symbol, start_date, end_date, data_type)
+            media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+            logger.info(f"Streaming historical data for {symbol} as {format}")
+            return StreamingResponse(stream_historical(symbol, rows, format), media_type=media_type)
         
-        # Fetch data
-        logger.info(f"Fetching data for {symbol}")
-        if not predictor.fetch_data():
-            logger.error(f"Failed to fetch data for {symbol}")
-            raise HTTPException(status_code=400, detail=f"Failed to fetch data for {symbol}")
+        data = data_handler.get_period_data(symbol, range, data_type, start_date, end_date)
         
-        # Convert to dictionary
-        if predictor.data is None:
+        if data.empty:
             logger.error(f"No data available for {symbol}")
-            raise HTTPException(status_code=500, detail="No data available")
-        data = predictor.data.reset_index().to_dict(orient='records')
+            raise HTTPException(status_code=400, detail=f"No data available for {symbol}")
+        
+        # Keep the column names clients got from the yfinance frame
+        data = data[['date', 'open', 'high', 'low', 'close', 'volume']].set_axis(HISTORICAL_FIELDS, axis=1)
         
         logger.info(f"Historical data fetched for {symbol}")
         return {
             "symbol": symbol,
-            "data": data
+            "data": data.to_dict(orient='records')
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch historical data for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch historical data: {str(e)}")
 
-@app.post("/update_model")
-def update_model(symbol: str, period: str = "1y", epochs: int = 30):
+@app.post("/update_model", status_code=202)
+def update_model(symbol: str, period: str = "1y", epochs: int = 30, mode: str = "auto", horizon: int = 1):
     """
     Update/retrain the model for a given symbol
+
+    mode 'auto' fine-tunes the saved model on new bars and only retrains from
+    scratch on drift or when the last full retrain is too old; 'incremental'
+    always fine-tunes and 'full' always retrains. 'search' tunes the model's
+    hyperparameters in parallel worker processes before a full retrain.
+    horizon selects which multi-horizon model to update. Retraining runs in
+    the background; poll /jobs/{job_id} for completion.
     """
     try:
-        logger.info(f"Updating model for {symbol} with period {period} and {epochs} epochs")
-        
-        # Create a unique key for the model
-        model_key = f"{symbol}_{period}"
-        
-        # Create and train a new model
-        predictor = LSTMPredictor(symbol, period=period or "1y")
-        
-        # Fetch data
-        logger.info(f"Fetching data for {symbol}")
-        if not predictor.fetch_data():
-            logger.error(f"Failed to fetch data for {symbol}")
-            raise HTTPException(status_code=400, detail=f"Failed to fetch data for {symbol}")
-        
-        # Train model
-        logger.info(f"Training model for {symbol}")
-        predictor.train(epochs=epochs or 30)
-        
-        # Store the trained model
-        trained_models[model_key] = predictor
-        
-        logger.info(f"Model updated successfully for {symbol}")
-        return {
-            "message": f"Model for {symbol} updated successfully",
-            "symbol": symbol
-        }
+        logger.info(f"Updating model for {symbol} with period {period}, {epochs} epochs, mode {mode}")
+        if mode not in ("auto", "incremental", "full", "search"):
+            raise HTTPException(status_code=400, detail=f"Unsupported update mode: {mode}")
+        period = period or "1y"
+        horizon = validate_horizon(horizon)
+        prediction_cache.invalidate(ModelRegistry.make_key(symbol, period, horizon))
+        return submit_training(symbol, period, epochs or 30, mode, horizon)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Model update failed for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Model update failed: {str(e)}")
 
+@app.on_event("startup")
+def start_background_warm_start():
+    """Kick off warm start after startup when it is not done at import time"""
+    if warm_start_state["status"] == "pending":
+        threading.Thread(target=warm_start, name="oasis-warm-start", daemon=True).start()
+
+if WARM_START_BEFORE_FORK:
+    warm_start()
+    if 'tensorflow' in sys.modules:
+        logger.warning("Warm start imported TensorFlow before the fork (a legacy model without "
+                       "an exported engine?); forked workers may hang on their first prediction")
+elif WARM_START_BLOCKING:
+    logger.info("Keras backend: warm start runs in each worker after startup instead of before the fork")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
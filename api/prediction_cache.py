@@ -0,0 +1,90 @@
+"""
+Prediction cache for Oasis
+Keeps recent prediction responses so repeated requests skip model inference
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class PredictionCache:
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        """
+        Initialize the prediction cache
+
+        Entries are keyed by model key, model version and the timestamp of the
+        latest bar, so a retrained model or a new bar never hits a stale entry.
+        Entries expire after ttl_seconds and the least recently used entries
+        are evicted once max_entries is reached.
+
+        Args:
+            max_entries (int): Maximum number of cached predictions
+            ttl_seconds (float): Time to live of each entry in seconds
+        """
+        self.max_entries = max_entries or int(os.getenv('PREDICTION_CACHE_SIZE', 1024))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('PREDICTION_CACHE_TTL_SECONDS', 300))
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_key, model_version, last_bar):
+        """Build a cache key from the model identity and its latest bar"""
+        return (model_key, str(model_version), str(last_bar))
+
+    def get(self, key):
+        """
+        Look up a cached prediction
+
+        Args:
+            key (tuple): Key built with make_key()
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Store a prediction
+
+        Args:
+            key (tuple): Key built with make_key()
+            value: Value to cache
+        """
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, model_key):
+        """
+        Drop every cached prediction for a model
+
+        Args:
+            model_key (str): Key of the model whose predictions are dropped
+        """
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == model_key]:
+                del self.entries[key]
+
+    def clear(self):
+        """Drop every cached prediction"""
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,287 @@
+"""
+Background training job queue for Oasis
+Runs model fetching and training off the request path with bounded concurrency
+"""
+import os
+import re
+import json
+import uuid
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from dotenv import load_dotenv
+
+from models.artifact_store import FILE_MODE
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class TrainingQueueFull(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs"""
+
+
+class TrainingJob:
+    """A single unit of background training work"""
+
+    def __init__(self, model_key, description=None):
+        """
+        Initialize a training job
+
+        Args:
+            model_key (str): Key of the model the job trains
+            description (str): Human readable description of the job
+        """
+        self.job_id = uuid.uuid4().hex
+        self.model_key = model_key
+        self.description = description or f"Train model {model_key}"
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.owner_pid = os.getpid()  # worker process running the job
+
+    @property
+    def done(self):
+        """Whether the job has finished, successfully or not"""
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self):
+        """Serialize the job for API responses"""
+        return {
+            'job_id': self.job_id,
+            'model_key': self.model_key,
+            'description': self.description,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Rebuild a job from the record another worker persisted
+
+        Args:
+            record (dict): Output of to_dict() plus the owning process id
+
+        Returns:
+            TrainingJob: A read-only snapshot of the job
+        """
+        job = cls(record['model_key'], record['description'])
+        job.job_id = record['job_id']
+        job.status = record['status']
+        job.result = record['result']
+        job.error = record['error']
+        job.owner_pid = record.get('owner_pid')
+        for name in ('created_at', 'started_at', 'finished_at'):
+            value = record.get(name)
+            setattr(job, name, datetime.fromisoformat(value) if value else None)
+        return job
+
+    @property
+    def orphaned(self):
+        """Whether the job is unfinished but the worker running it has exited"""
+        if self.done or not self.owner_pid or self.owner_pid == os.getpid():
+            return False
+        try:
+            os.kill(self.owner_pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+
+class TrainingQueue:
+    def __init__(self, max_workers=None, max_pending=None, max_tracked_jobs=None, job_dir=None):
+        """
+        Initialize the training queue
+
+        Job records are also written to job_dir, so any API worker on the
+        node can answer a status poll for a job another worker runs, and
+        records outlive the worker that created them.
+
+        Args:
+            max_workers (int): Number of trainings allowed to run at once
+            max_pending (int): Maximum number of queued or running jobs
+            max_tracked_jobs (int): Number of job records kept for status polling
+            job_dir (str): Directory shared by the workers for job records
+                (defaults to TRAINING_JOB_DIR, or jobs/ under MODEL_DIR)
+        """
+        self.max_workers = max_workers or int(os.getenv('TRAINING_WORKERS', 1))
+        self.max_pending = max_pending or int(os.getenv('TRAINING_QUEUE_SIZE', 32))
+        self.max_tracked_jobs = max_tracked_jobs or int(os.getenv('TRAINING_MAX_TRACKED_JOBS', 1000))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='oasis-training'
+        )
+        self.jobs = OrderedDict()
+        self.active = {}  # model_key -> unfinished job, for single-flight coalescing
+        self.lock = threading.Lock()
+
+        self.job_dir = job_dir or os.getenv('TRAINING_JOB_DIR') or os.path.join(os.getenv('MODEL_DIR', 'models'), 'jobs')
+        os.makedirs(self.job_dir, exist_ok=True)
+
+    def pending_count(self):
+        """Number of jobs that are queued or running"""
+        with self.lock:
+            return sum(1 for job in self.jobs.values() if not job.done)
+
+    def submit(self, model_key, func, *args, description=None, **kwargs):
+        """
+        Queue a training function for background execution
+
+        Only one job per model key is ever queued or running: submitting a key
+        that already has an unfinished job returns that job instead of
+        starting a duplicate training run.
+
+        Args:
+            model_key (str): Key of the model the job trains
+            func (callable): Function doing the work; its return value becomes the job result
+            description (str): Human readable description of the job
+
+        Returns:
+            tuple: (TrainingJob, created) where created is False if an
+                existing job was returned
+        """
+        with self.lock:
+            existing = self.active.get(model_key)
+            if existing is not None and not existing.done:
+                logger.info(f"Joining in-flight training job {existing.job_id} for {model_key}")
+                return existing, False
+
+            pending = sum(1 for job in self.jobs.values() if not job.done)
+            if pending >= self.max_pending:
+                raise TrainingQueueFull(f"Training queue is full ({pending} pending jobs)")
+
+            job = TrainingJob(model_key, description)
+            self.jobs[job.job_id] = job
+            self.active[model_key] = job
+            self._prune()
+
+        self._persist(job)
+        logger.info(f"Queued training job {job.job_id} for {model_key}")
+        self.executor.submit(self._run, job, func, args, kwargs)
+        return job, True
+
+    def get_active(self, model_key):
+        """
+        Get the unfinished job for a model key, if any
+
+        Args:
+            model_key (str): Key of the model
+
+        Returns:
+            TrainingJob: The queued or running job, or None
+        """
+        with self.lock:
+            return self.active.get(model_key)
+
+    def get(self, job_id):
+        """
+        Look up a job by id, including jobs queued by other workers
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            TrainingJob: The job, or None if it is unknown or was pruned
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None or not JOB_ID.match(job_id):
+            return job
+
+        try:
+            with open(self._record_path(job_id)) as f:
+                return TrainingJob.from_record(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read job record {job_id}: {e}")
+            return None
+
+    def _record_path(self, job_id):
+        """Path of a job's shared record"""
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _persist(self, job):
+        """
+        Write a job's record for the other workers
+
+        The record is replaced atomically so readers never see a partial
+        file. Failing to write it only costs cross-worker visibility, so
+        errors are logged rather than failing the job.
+        """
+        record = job.to_dict()
+        record['owner_pid'] = job.owner_pid
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.job_dir, prefix=job.job_id, suffix='.tmp')
+            os.fchmod(fd, FILE_MODE)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(record, f, default=str)
+            os.replace(tmp_path, self._record_path(job.job_id))
+        except OSError as e:
+            logger.warning(f"Could not write job record {job.job_id}: {e}")
+
+    def _run(self, job, func, args, kwargs):
+        """Execute a job and record its outcome"""
+        job.status = 'running'
+        job.started_at = datetime.now()
+        self._persist(job)
+        logger.info(f"Started training job {job.job_id} for {job.model_key}")
+        try:
+            job.result = func(*args, **kwargs)
+            job.status = 'completed'
+            logger.info(f"Training job {job.job_id} for {job.model_key} completed")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            logger.error(f"Training job {job.job_id} for {job.model_key} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            self._persist(job)
+            with self.lock:
+                if self.active.get(job.model_key) is job:
+                    del self.active[job.model_key]
+
+    def _prune(self):
+        """Drop the oldest finished job records beyond the tracking limit"""
+        excess = len(self.jobs) - self.max_tracked_jobs
+        if excess > 0:
+            for job_id in [job_id for job_id, job in self.jobs.items() if job.done][:excess]:
+                del self.jobs[job_id]
+
+        # Shared records of every worker, oldest first; unfinished jobs rewrite theirs
+        records = []
+        try:
+            for entry in os.scandir(self.job_dir):
+                if entry.name.endswith('.json'):
+                    records.append((entry.stat().st_mtime, entry.name[:-len('.json')]))
+        except OSError:
+            return
+        excess = len(records) - self.max_tracked_jobs
+        for _, job_id in sorted(records)[:max(0, excess)]:
+            if job_id in self.jobs:
+                continue
+            try:
+                os.remove(self._record_path(job_id))
+            except OSError:
+                pass
+
+    def shutdown(self, wait=False):
+        """Stop accepting jobs and release the worker threads"""
+        self.executor.shutdown(wait=wait)
@@ -13,6 +13,12 @@ from contextlib import contextmanager
 # Load environment variables
 load_dotenv()
 
+# Start date used for 'max' periods, earlier than any listed bar
+MIN_HISTORY_DATE = "1900-01-01"
+
+# How long today's bar is served from the database before it is refetched
+DATA_TAIL_TTL_SECONDS = int(os.getenv('DATA_TAIL_TTL_SECONDS', 3600))
+
 class DataHandler:
     def __init__(self, db_path=None):
         """
@@ -22,12 +28,24 @@ class DataHandler:
             db_path (str): Path to SQLite database file
         """
         self.db_path = db_path or os.getenv('DB_PATH', 'data/market_data.db')
+        
+        # Create database directory if it doesn't exist
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        
         self.init_database()
         
     @contextmanager
-    def get_db_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
+    def get_db_connection(self, check_same_thread=True):
+        """
+        Context manager for database connections
+        
+        Args:
+            check_same_thread (bool): Passed to sqlite3.connect; disable it only
+                for a connection used by one thread at a time, even if not always the same one
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
         try:
             yield conn
         finally:
@@ -82,8 +100,90 @@ class DataHandler:
                 ON crypto_data (symbol, date)
             ''')
             
+            # Create table tracking the date range fetched from upstream per symbol
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS data_coverage (
+                    symbol TEXT NOT NULL,
+                    data_type TEXT NOT NULL,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (symbol, data_type)
+                )
+            ''')
+            
             conn.commit()
     
+    @staticmethod
+    def period_start_date(period, today=None):
+        """
+        Translate a yfinance style period into a start date
+        
+        Args:
+            period (str): Period such as '5d', '1mo', '1y', 'ytd' or 'max'
+                (the dashboard's '1w', '1m' and 'all' are accepted too)
+            today (datetime): Reference date, defaults to now
+            
+        Returns:
+            str: Start date in YYYY-MM-DD format (MIN_HISTORY_DATE for 'max')
+        """
+        today = today or datetime.now()
+        period = (period or "1y").lower()
+        
+        if period in ("max", "all"):
+            return MIN_HISTORY_DATE
+        if period == "ytd":
+            return today.replace(month=1, day=1).strftime('%Y-%m-%d')
+        
+        units = {"d": 1, "wk": 7, "w": 7, "mo": 31, "m": 31, "y": 366}
+        for unit, days in units.items():
+            if period.endswith(unit) and period[:-len(unit)].isdigit():
+                return (today - timedelta(days=int(period[:-len(unit)]) * days)).strftime('%Y-%m-%d')
+        
+        raise ValueError(f"Unsupported period: {period}")
+    
+    def get_coverage(self, symbol, data_type="stock"):
+        """
+        Get the date range already fetched from upstream for a symbol
+        
+        Returns:
+            tuple: (start_date, end_date, updated_at) where the dates are in
+                YYYY-MM-DD format and updated_at is when the latest bars were
+                last fetched (UTC), or None
+        """
+        with self.get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT start_date, end_date, updated_at FROM data_coverage WHERE symbol = ? AND data_type = ?",
+                (symbol, data_type)
+            ).fetchone()
+            return tuple(row) if row else None
+    
+    def _update_coverage(self, conn, symbol, data_type, start_date, end_date):
+        """Widen the recorded upstream coverage of a symbol"""
+        # updated_at tracks the freshness of the latest bars, so backfilling older history leaves it alone
+        conn.execute('''
+            INSERT INTO data_coverage (symbol, data_type, start_date, end_date)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(symbol, data_type) DO UPDATE SET
+                start_date = MIN(start_date, excluded.start_date),
+                updated_at = CASE WHEN excluded.end_date >= end_date THEN CURRENT_TIMESTAMP ELSE updated_at END,
+                end_date = MAX(end_date, excluded.end_date)
+        ''', (symbol, data_type, start_date, end_date))
+    
+    @staticmethod
+    def tail_is_stale(updated_at, now=None):
+        """
+        Whether bars fetched at updated_at may have changed since
+        
+        Args:
+            updated_at (str): UTC timestamp from the coverage table
+            now (datetime): Reference time in UTC, defaults to now
+        """
+        if not updated_at:
+            return True
+        now = now or datetime.utcnow()
+        return (now - datetime.fromisoformat(updated_at)).total_seconds() > DATA_TAIL_TTL_SECONDS
+    
     def fetch_and_store_data(self, symbol, period="1y", data_type="stock"):
         """
         Fetch data using yfinance and store it in the database
@@ -104,6 +204,12 @@ class DataHandler:
             
             # Store data in database
             self.store_data(symbol, data, data_type)
+            with self.get_db_connection() as conn:
+                self._update_coverage(
+                    conn, symbol, data_type,
+                    self.period_start_date(period), datetime.now().strftime('%Y-%m-%d')
+                )
+                conn.commit()
             print(f"Successfully fetched and stored {len(data)} records for {symbol}")
             return True
         except Exception as e:
@@ -179,6 +285,175 @@ class DataHandler:
             
             return data
     
+    def fetch_and_store_range(self, symbol, start_date, end_date, data_type="stock"):
+        """
+        Fetch a date range using yfinance, store it and record the coverage
+        
+        Args:
+            symbol (str): Stock or crypto symbol
+            start_date (str): Start date in YYYY-MM-DD format (MIN_HISTORY_DATE for all history)
+            end_date (str): End date in YYYY-MM-DD format, inclusive
+            data_type (str): Type of data ('stock' or 'crypto')
+        """
+        ticker = yf.Ticker(symbol)
+        if start_date <= MIN_HISTORY_DATE:
+            data = ticker.history(period="max")
+        else:
+            # yfinance treats the end date as exclusive
+            end_exclusive = (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+            data = ticker.history(start=start_date, end=end_exclusive)
+        
+        if not data.empty:
+            self.store_data(symbol, data, data_type)
+        
+        # Record the range even when it had no bars (weekends, holidays)
+        with self.get_db_connection() as conn:
+            self._update_coverage(conn, symbol, data_type, start_date, end_date)
+            conn.commit()
+    
+    def ensure_coverage(self, symbol, start_date, end_date, data_type="stock"):
+        """
+        Make sure a date range is in the database, fetching only what is missing
+        
+        Today's bar keeps changing until the session closes, so a range
+        ending today refetches it once it is older than DATA_TAIL_TTL_SECONDS;
+        the scheduler's hourly updates usually keep it fresher than that.
+        
+        Args:
+            symbol (str): Stock or crypto symbol
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format
+            data_type (str): Type of data ('stock' or 'crypto')
+        """
+        coverage = self.get_coverage(symbol, data_type)
+        
+        if coverage is None:
+            self.fetch_and_store_range(symbol, start_date, end_date, data_type)
+            return
+        
+        covered_start, covered_end, updated_at = coverage
+        if start_date < covered_start:
+            self.fetch_and_store_range(symbol, start_date, covered_start, data_type)
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        if covered_end < end_date and covered_end < today:
+            self.fetch_and_store_range(symbol, covered_end, end_date, data_type)
+        elif end_date >= today and self.tail_is_stale(updated_at):
+            try:
+                self.fetch_and_store_range(symbol, covered_end, end_date, data_type)
+            except Exception as e:
+                # Refreshing today's unfinished bar is best effort; stored bars still serve
+                print(f"Error refreshing latest bars for {symbol}: {e}")
+    
+    def period_range(self, period="1y", start_date=None, end_date=None):
+        """
+        Resolve a period, optionally narrowed by start/end dates, into a date range
+        
+        Returns:
+            tuple: (start_date, end_date) in YYYY-MM-DD format
+        """
+        period_start = self.period_start_date(period)
+        today = datetime.now().strftime('%Y-%m-%d')
+        start_date = max(period_start, start_date) if start_date else period_start
+        end_date = min(today, end_date) if end_date else today
+        return start_date, end_date
+    
+    def get_period_data(self, symbol, period="1y", data_type="stock", start_date=None, end_date=None):
+        """
+        Read a period of historical data through the database
+        
+        Only the parts of the period that were never fetched from upstream are
+        requested from yfinance; they are stored before the read so later
+        requests are served from the database alone.
+        
+        Args:
+            symbol (str): Stock or crypto symbol
+            period (str): Period for historical data ('1mo', '1y', 'max', ...)
+            data_type (str): Type of data ('stock' or 'crypto')
+            start_date (str): Optional start date narrowing the period, YYYY-MM-DD
+            end_date (str): Optional end date narrowing the period, YYYY-MM-DD
+            
+        Returns:
+            DataFrame: Historical data
+        """
+        start_date, end_date = self.period_range(period, start_date, end_date)
+        self.ensure_coverage(symbol, start_date, end_date, data_type)
+        
+        return self.get_historical_data(symbol, start_date, end_date, data_type)
+    
+    @staticmethod
+    def data_type_for(symbol):
+        """
+        Guess whether a symbol is a stock or a crypto pair
+        
+        Crypto pairs use yfinance's BASE-QUOTE form, e.g. 'BTC-USD'.
+        
+        Returns:
+            str: 'crypto' or 'stock'
+        """
+        return "crypto" if symbol.upper().endswith(("-USD", "-USDT", "-EUR", "-BTC")) else "stock"
+    
+    def get_price_history(self, symbol, period="1y", data_type=None):
+        """
+        Read a period of bars through the database, shaped like yfinance's history()
+        
+        Args:
+            symbol (str): Stock or crypto symbol
+            period (str): Period for historical data
+            data_type (str): Type of data ('stock' or 'crypto'), guessed from the symbol if omitted
+            
+        Returns:
+            DataFrame: Open, High, Low, Close and Volume indexed by date
+        """
+        data = self.get_period_data(symbol, period, data_type or self.data_type_for(symbol))
+        data = data.rename(columns={
+            'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'
+        })
+        data.index = pd.DatetimeIndex(pd.to_datetime(data['date']), name='Date')
+        return data[['Open', 'High', 'Low', 'Close', 'Volume']]
+    
+    def iter_historical_rows(self, symbol, start_date=None, end_date=None, data_type="stock", chunk_size=1000):
+        """
+        Stream historical rows from the database in chunks
+        
+        Rows are read with fetchmany so memory stays bounded by chunk_size no
+        matter how long the range is. A StreamingResponse advances the
+        generator on whichever threadpool thread is free, so its connection
+        allows use from another thread; the generator still only runs one
+        step at a time.
+        
+        Args:
+            symbol (str): Stock or crypto symbol
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format
+            data_type (str): Type of data ('stock' or 'crypto')
+            chunk_size (int): Number of rows fetched per round trip
+            
+        Yields:
+            tuple: (date, open, high, low, close, volume)
+        """
+        with self.get_db_connection(check_same_thread=False) as conn:
+            table_name = "stock_data" if data_type == "stock" else "crypto_data"
+            query = f"SELECT date, open, high, low, close, volume FROM {table_name} WHERE symbol = ?"
+            params = [symbol]
+            
+            if start_date:
+                query += " AND date >= ?"
+                params.append(start_date)
+                
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date)
+                
+            query += " ORDER BY date"
+            
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+    
     def get_latest_data(self, symbol, days=30, data_type="stock"):
         """
         Get the latest data for a symbol
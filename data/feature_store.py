@@ -0,0 +1,280 @@
+"""
+Feature store for Oasis
+Keeps OHLCV columns and derived indicators per symbol as a growing float32
+array, computing only the bars that arrived since the last update
+"""
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+# Raw columns stored by DataHandler and returned by yfinance
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Derived indicators; windowed ones take their window as a suffix, e.g. sma_20
+INDICATORS = {
+    'return': 'Daily close-to-close return',
+    'range': 'High-low range relative to the close',
+    'sma': 'Simple moving average of the close over N bars',
+    'volatility': 'Standard deviation of daily returns over N bars',
+}
+
+WINDOWED_INDICATOR = re.compile(r'^(sma|volatility)_(\d+)$')
+
+
+def feature_columns(features):
+    """
+    Normalize a list of feature names, with the close first
+
+    The close is always column 0 because it is what the models predict.
+
+    Args:
+        features (list): Feature names, e.g. ['Close', 'Volume', 'return', 'sma_20']
+
+    Returns:
+        list: Validated feature names starting with 'Close'
+    """
+    columns = ['Close']
+    for name in features:
+        if name in columns:
+            continue
+        if name not in OHLCV_COLUMNS and name not in INDICATORS and not WINDOWED_INDICATOR.match(name):
+            raise ValueError(f"Unknown feature: {name}")
+        columns.append(name)
+    return columns
+
+
+def warmup_bars(columns):
+    """Number of earlier bars needed to compute the features of one bar"""
+    warmup = 0
+    for name in columns:
+        match = WINDOWED_INDICATOR.match(name)
+        if match:
+            warmup = max(warmup, int(match.group(2)))
+        elif name == 'return':
+            warmup = max(warmup, 1)
+    return warmup
+
+
+def compute_features(frame, columns):
+    """
+    Compute feature columns over a frame of OHLCV bars
+
+    Rolling indicators use whatever history the frame holds, so the first
+    bars of a history get partial windows and undefined values become 0.
+
+    Args:
+        frame (DataFrame): Bars with OHLCV columns
+        columns (list): Feature names from feature_columns()
+
+    Returns:
+        ndarray: float32 array of shape (bars, features)
+    """
+    close = frame['Close']
+    returns = close.pct_change()
+
+    values = []
+    for name in columns:
+        match = WINDOWED_INDICATOR.match(name)
+        if name in OHLCV_COLUMNS:
+            series = frame[name]
+        elif name == 'return':
+            series = returns
+        elif name == 'range':
+            series = (frame['High'] - frame['Low']) / close
+        elif match.group(1) == 'sma':
+            series = close.rolling(int(match.group(2)), min_periods=1).mean()
+        else:
+            series = returns.rolling(int(match.group(2)), min_periods=2).std()
+        values.append(series.to_numpy(dtype=np.float64))
+
+    features = np.column_stack(values).astype(np.float32)
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _timestamps(data):
+    """Bar timestamps of a frame as int64 nanoseconds"""
+    return pd.DatetimeIndex(data.index).asi8
+
+
+class FeatureSet:
+    def __init__(self, columns):
+        """
+        Feature columns of one symbol's history, maintained incrementally
+
+        Values live in a column-major float32 buffer that grows
+        geometrically, so appending bars is amortized O(new bars).
+
+        Args:
+            columns (list): Feature names from feature_columns()
+        """
+        self.columns = list(columns)
+        self.warmup = warmup_bars(self.columns)
+        self.rows = 0
+        self._buffer = None
+        self._index = None  # bar timestamps as int64 nanoseconds
+        self.lock = threading.Lock()
+
+    @property
+    def values(self):
+        """Computed features, shape (rows, features), as a view of the buffer"""
+        if self._buffer is None:
+            return np.empty((0, len(self.columns)), dtype=np.float32)
+        return self._buffer[:self.rows]
+
+    @property
+    def nbytes(self):
+        """Bytes held by the feature and index buffers"""
+        if self._buffer is None:
+            return 0
+        return self._buffer.nbytes + self._index.nbytes
+
+    def _reserve(self, rows):
+        """Grow the buffers to hold at least `rows` bars"""
+        if self._buffer is not None and rows <= len(self._buffer):
+            return
+        capacity = max(rows, 2 * self.rows, 256)
+        buffer = np.empty((capacity, len(self.columns)), dtype=np.float32, order='F')
+        index = np.empty(capacity, dtype=np.int64)
+        if self._buffer is not None:
+            buffer[:self.rows] = self._buffer[:self.rows]
+            index[:self.rows] = self._index[:self.rows]
+        self._buffer = buffer
+        self._index = index
+
+    def _aligned_rows(self, data, changed):
+        """
+        Where the stored features line up with `data`
+
+        Histories fetched for a rolling period start a little later each
+        day, so the stored rows are matched to the frame by timestamp
+        rather than by position.
+
+        Returns:
+            tuple: (shift, valid) where data rows [0, valid) are stored rows
+                [shift, shift + valid) with the same timestamp and close
+        """
+        if self.rows == 0 or len(data) == 0:
+            return 0, 0
+
+        # A first bar that was never stored means a different history, e.g. a longer period
+        index = _timestamps(data)
+        shift = int(np.searchsorted(self._index[:self.rows], index[0]))
+        if shift == self.rows or self._index[shift] != index[0]:
+            return 0, 0
+
+        valid = min(self.rows - shift, len(data), len(data) if changed is None else changed)
+        # A different close means prices were revised, e.g. adjusted for a split or dividend
+        close = data['Close'].to_numpy(dtype=np.float32)[:valid]
+        matches = (self._index[shift:shift + valid] == index[:valid]) & (self._buffer[shift:shift + valid, 0] == close)
+        mismatches = np.flatnonzero(~matches)
+        return shift, int(mismatches[0]) if len(mismatches) else valid
+
+    def _update(self, data, changed):
+        """
+        Compute the features of every bar from the first new or changed one on
+
+        Each computed bar gets the warmup bars before it that its rolling
+        indicators need, so results match computing the whole history.
+        When the history starts later than the stored one, the kept rows are
+        moved to the front and only the first warmup bars, whose windows
+        lost the bars before them, are recomputed. The caller holds the lock.
+        """
+        shift, valid = self._aligned_rows(data, changed)
+        if shift == 0 and valid == len(data) and self.rows == len(data):
+            return
+
+        if shift and valid:
+            self._buffer[:valid] = self._buffer[shift:shift + valid]
+            self._index[:valid] = self._index[shift:shift + valid]
+            head = min(self.warmup, valid)
+            if head:
+                self._buffer[:head] = compute_features(data.iloc[:head], self.columns)
+        self.rows = valid
+
+        offset = max(0, valid - self.warmup)
+        features = compute_features(data.iloc[offset:], self.columns)[valid - offset:]
+
+        self._reserve(len(data))
+        self._buffer[valid:len(data)] = features
+        self._index[valid:len(data)] = _timestamps(data)[valid:]
+        self.rows = len(data)
+
+    def features(self, data, start=0, changed=None):
+        """
+        Features of a history from row `start` on, computing only what is missing
+
+        Args:
+            data (DataFrame): Full history of bars, oldest first
+            start (int): First row to return
+            changed (int): First row whose bar is new or changed, if known
+
+        Returns:
+            ndarray: float32 copy of shape (len(data) - start, features)
+        """
+        with self.lock:
+            self._update(data, changed)
+            return np.array(self.values[start:])
+
+
+class FeatureStore:
+    def __init__(self):
+        """
+        Process-wide cache of feature sets, one per symbol history and column list
+
+        Predictors of the same symbol and period share a feature set, so a
+        freshly created predictor only computes the bars its predecessors
+        have not seen.
+        """
+        self.sets = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, columns):
+        """
+        Get the feature set for a history, creating it if needed
+
+        Args:
+            key (str): History the features are computed over, e.g. 'TSLA_1y'
+            columns (list): Feature names from feature_columns()
+
+        Returns:
+            FeatureSet: The shared feature set
+        """
+        with self.lock:
+            cache_key = (key, tuple(columns))
+            if cache_key not in self.sets:
+                self.sets[cache_key] = FeatureSet(columns)
+            return self.sets[cache_key]
+
+    def features(self, key, columns, data, start=0, changed=None):
+        """
+        Features of a history from row `start` on, computing only what is missing
+
+        Args:
+            key (str): History the features are computed over
+            columns (list): Feature names from feature_columns()
+            data (DataFrame): Full history of bars, oldest first
+            start (int): First row to return
+            changed (int): First row whose bar is new or changed, if known
+
+        Returns:
+            ndarray: float32 array of shape (len(data) - start, features)
+        """
+        return self.get(key, columns).features(data, start, changed)
+
+    def nbytes(self, key=None):
+        """Bytes held by the feature sets of one history, or of all of them"""
+        with self.lock:
+            return sum(feature_set.nbytes for cache_key, feature_set in self.sets.items()
+                       if key is None or cache_key[0] == key)
+
+    def clear(self, key=None):
+        """Drop the cached features of one history, or of all of them"""
+        with self.lock:
+            for cache_key in list(self.sets):
+                if key is None or cache_key[0] == key:
+                    del self.sets[cache_key]
+
+
+# Shared by every predictor in the process
+feature_store = FeatureStore()
@@ -10,20 +10,27 @@ import os
 # Add the models and data directories to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from models.lstm_predictor import LSTMPredictor
+from models.execution_config import configure_process
+from models.lstm_predictor import GlobalLSTMPredictor, LSTMPredictor
+from models.model_registry import ModelRegistry
 from data.data_handler import DataHandler
 
 class DataScheduler:
     def __init__(self):
         """Initialize the scheduler"""
+        configure_process('training')  # The scheduler only trains; API workers keep their own share
         self.scheduler = BlockingScheduler()
         self.data_handler = DataHandler()
-        self.models = {}  # Store trained models in memory
+        self.registry = ModelRegistry(data_handler=self.data_handler)  # Share retrained models with the API workers
         
         # Define symbols to track
         self.stock_symbols = ['TSLA', 'AAPL', 'GOOGL', 'MSFT']
         self.crypto_symbols = ['BTC-USD', 'ETH-USD']
         
+        # Optionally train one global model over all tracked symbols
+        self.global_model_enabled = os.getenv('GLOBAL_MODEL_ENABLED', 'False').lower() == 'true'
+        self.global_model_period = os.getenv('GLOBAL_MODEL_PERIOD', '1y')
+        
     def update_data(self):
         """Update market data for all tracked symbols"""
         print("Updating market data...")
@@ -64,14 +71,22 @@ class DataScheduler:
         for symbol in self.stock_symbols:
             try:
                 print(f"Retraining model for {symbol}...")
-                predictor = LSTMPredictor(symbol, period='6mo')
-                
-                if predictor.fetch_data():
-                    predictor.train(epochs=20)
-                    self.models[f"{symbol}_stock"] = predictor
-                    print(f"Retrained model for {symbol}")
-                else:
-                    print(f"Failed to fetch data for {symbol}")
+                # Warm start from the saved model; update() decides between
+                # fine-tuning on new bars and a full retrain. The training lock
+                # keeps API workers from training the same model meanwhile
+                with self.registry.training_lock(symbol, '6mo'):
+                    predictor, _ = self.registry.load_saved(symbol, '6mo')
+                    if predictor is None:
+                        predictor = LSTMPredictor(symbol, period='6mo')
+                        predictor.load_config()
+                    
+                    if predictor.fetch_data():
+                        action = predictor.update(mode='auto', epochs=20)
+                        if action != 'none':
+                            self.registry.put(predictor)
+                        print(f"Retrained model for {symbol} ({action})")
+                    else:
+                        print(f"Failed to fetch data for {symbol}")
             except Exception as e:
                 print(f"Error retraining model for {symbol}: {e}")
         
@@ -79,19 +94,44 @@ class DataScheduler:
         for symbol in self.crypto_symbols:
             try:
                 print(f"Retraining model for {symbol}...")
-                predictor = LSTMPredictor(symbol, period='6mo')
-                
-                if predictor.fetch_data():
-                    predictor.train(epochs=20)
-                    self.models[f"{symbol}_crypto"] = predictor
-                    print(f"Retrained model for {symbol}")
-                else:
-                    print(f"Failed to fetch data for {symbol}")
+                # Warm start from the saved model; update() decides between
+                # fine-tuning on new bars and a full retrain. The training lock
+                # keeps API workers from training the same model meanwhile
+                with self.registry.training_lock(symbol, '6mo'):
+                    predictor, _ = self.registry.load_saved(symbol, '6mo')
+                    if predictor is None:
+                        predictor = LSTMPredictor(symbol, period='6mo')
+                        predictor.load_config()
+                    
+                    if predictor.fetch_data():
+                        action = predictor.update(mode='auto', epochs=20)
+                        if action != 'none':
+                            self.registry.put(predictor)
+                        print(f"Retrained model for {symbol} ({action})")
+                    else:
+                        print(f"Failed to fetch data for {symbol}")
             except Exception as e:
                 print(f"Error retraining model for {symbol}: {e}")
                 
         print("Model retraining completed.")
     
+    def retrain_global_model(self):
+        """Retrain the global model on every tracked symbol in one batched job"""
+        print("Retraining global model...")
+        
+        try:
+            predictor = GlobalLSTMPredictor(
+                self.stock_symbols + self.crypto_symbols, period=self.global_model_period
+            )
+            failed = predictor.fetch_data()
+            if failed:
+                print(f"Failed to fetch data for {', '.join(failed)}")
+            predictor.train(epochs=20)
+            self.registry.put_global(predictor)
+            print("Global model retraining completed.")
+        except Exception as e:
+            print(f"Error retraining global model: {e}")
+    
     def start_scheduler(self):
         """Start the scheduler with predefined jobs"""
         print("Starting Oasis Scheduler...")
@@ -114,6 +154,16 @@ class DataScheduler:
             replace_existing=True
         )
         
+        # Add job to retrain the global model daily at 3 AM
+        if self.global_model_enabled:
+            self.scheduler.add_job(
+                self.retrain_global_model,
+                CronTrigger(hour=3, minute=0),  # Run at 3:00 AM daily
+                id='retrain_global_model',
+                name='Retrain Global Model',
+                replace_existing=True
+            )
+        
         # Start the scheduler
         try:
             print("Scheduler started. Press Ctrl+C to exit.")
@@ -132,8 +182,10 @@ if __name__ == "__main__":
             scheduler.update_data()
         elif sys.argv[1] == "retrain":
             scheduler.retrain_models()
+        elif sys.argv[1] == "retrain-global":
+            scheduler.retrain_global_model()
         else:
-            print("Usage: python scheduler.py [update|retrain]")
+            print("Usage: python scheduler.py [update|retrain|retrain-global]")
     else:
         # Start the scheduler
         scheduler.start_scheduler()
\ No newline at end of file
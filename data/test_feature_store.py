@@ -0,0 +1,123 @@
+"""
+Parity test for the Oasis feature store
+Checks that incrementally maintained features match computing the whole history
+"""
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from data.feature_store import FeatureSet, FeatureStore, compute_features, feature_columns
+
+COLUMNS = feature_columns(['Volume', 'return', 'range', 'sma_20', 'volatility_10'])
+
+def synthetic_bars(rows, seed=0):
+    """Random-walk OHLCV bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    index = pd.bdate_range('2020-01-01', periods=rows)
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(100000, 1000000, rows)
+    }, index=index)
+
+def check(name, actual, data, start=0):
+    """Compare features against a full recompute and report the difference"""
+    expected = compute_features(data, COLUMNS)[start:]
+    assert actual.shape == expected.shape, f"{name}: shape {actual.shape}, expected {expected.shape}"
+    error = np.max(np.abs(actual - expected))
+    print(f"{name:<32} rows {len(actual):>4}, max abs error {error:.2e}")
+    assert np.allclose(actual, expected, rtol=1e-6, atol=1e-6), f"{name}: features differ from a full recompute"
+
+def test_incremental_parity(rows=600, steps=(300, 301, 340, 341, 500, 600)):
+    """Append bars in steps of different sizes"""
+    print("Testing incremental updates against a full recompute")
+    print("=" * 50)
+
+    data = synthetic_bars(rows)
+    feature_set = FeatureSet(COLUMNS)
+    for end in steps:
+        check(f"append to {end} bars", feature_set.features(data.iloc[:end]), data.iloc[:end])
+    check("slice from row 450", feature_set.features(data, start=450), data, start=450)
+
+def test_changed_bars(rows=400):
+    """Revise the latest bar, then history before it"""
+    print("\nTesting revised bars")
+    print("=" * 50)
+
+    data = synthetic_bars(rows)
+    feature_set = FeatureSet(COLUMNS)
+    feature_set.features(data)
+
+    # Today's bar updated while the session is still open
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] *= 1.05
+    check("changed latest bar", feature_set.features(revised, changed=rows - 1), revised)
+
+    # Prices adjusted for a split, which rewrites the whole history
+    adjusted = revised.copy()
+    adjusted[['Open', 'High', 'Low', 'Close']] /= 2
+    check("adjusted history", feature_set.features(adjusted), adjusted)
+
+    # A different period starting on another bar
+    shifted = synthetic_bars(rows + 50, seed=1).iloc[50:]
+    check("different first bar", feature_set.features(shifted), shifted)
+
+def test_rolling_period(rows=700, window=500):
+    """Move the start of the history forward, the way a rolling '1y' fetch does each day"""
+    print("\nTesting a rolling period")
+    print("=" * 50)
+
+    import data.feature_store as feature_store_module
+    computed = []
+    full_compute = feature_store_module.compute_features
+
+    def counting_compute(frame, columns):
+        computed.append(len(frame))
+        return full_compute(frame, columns)
+
+    data = synthetic_bars(rows)
+    feature_set = FeatureSet(COLUMNS)
+    feature_set.features(data.iloc[:window])
+
+    feature_store_module.compute_features = counting_compute
+    try:
+        for start in (1, 2, 7, 150):
+            computed.clear()
+            frame = data.iloc[start:start + window]
+            check(f"period starting at bar {start}", feature_set.features(frame), frame)
+            # Only the warmup head and the new bars (with their warmup) are recomputed
+            assert sum(computed) <= 2 * feature_set.warmup + start, f"recomputed {sum(computed)} bars"
+    finally:
+        feature_store_module.compute_features = full_compute
+
+    # A period reaching further back than what is stored is rebuilt
+    check("earlier first bar", feature_set.features(data.iloc[100:]), data.iloc[100:])
+
+def test_store_accounting(rows=1000):
+    """Shared sets per history, their size and clearing them"""
+    print("\nTesting feature store accounting")
+    print("=" * 50)
+
+    store = FeatureStore()
+    data = synthetic_bars(rows)
+    store.features('TEST_1y', COLUMNS, data)
+    store.features('TEST_1y', ['Close'], data)
+    store.features('OTHER_1y', COLUMNS, data)
+
+    assert store.get('TEST_1y', COLUMNS) is store.get('TEST_1y', COLUMNS)
+    held = store.nbytes('TEST_1y')
+    store.clear('TEST_1y')
+    print(f"TEST_1y held {held / 1024:.1f}KB before clear, {store.nbytes('TEST_1y')} after; "
+          f"OTHER_1y kept {store.nbytes('OTHER_1y') / 1024:.1f}KB")
+    assert held >= rows * (len(COLUMNS) + 1) * 4, "feature buffers are not counted"
+    assert store.nbytes('TEST_1y') == 0 and store.nbytes('OTHER_1y') > 0, "clear dropped the wrong history"
+
+if __name__ == "__main__":
+    test_incremental_parity()
+    test_changed_bars()
+    test_rolling_period()
+    test_store_accounting()
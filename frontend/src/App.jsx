@@ -54,7 +54,8 @@ function App() {
         const response = await axios.get('/api/historical', {
           params: {
             symbol: selectedSymbol,
-            range: timeRange.toLowerCase()
+            range: timeRange.toLowerCase(),
+            type: assetType
           }
         });
         setHistoricalData(response.data.data);
@@ -66,15 +67,34 @@ function App() {
     };
     
     fetchHistoricalData();
-  }, [selectedSymbol, timeRange]);
+  }, [selectedSymbol, timeRange, assetType]);
+
+  const waitForJob = async (jobId) => {
+    // Training runs in the background; poll until the job settles
+    while (true) {
+      const response = await axios.get(`/api/jobs/${jobId}`);
+      if (response.data.status === 'completed') {
+        return response.data;
+      }
+      if (response.data.status === 'failed') {
+        throw new Error(response.data.error);
+      }
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+  };
 
   const handlePredict = async () => {
     setLoading(true);
     try {
-      const response = await axios.post('/api/predict', {
+      const request = {
         symbol: selectedSymbol,
         type: assetType
-      });
+      };
+      let response = await axios.post('/api/predict', request);
+      if (response.status === 202) {
+        await waitForJob(response.data.job_id);
+        response = await axios.post('/api/predict', request);
+      }
       setPredictionData(response.data);
     } catch (error) {
       console.error('Error fetching prediction:', error);
@@ -86,13 +106,14 @@ function App() {
 
   const handleRefreshModel = async () => {
     try {
-      await axios.post('/api/update_model', null, {
+      const response = await axios.post('/api/update_model', null, {
         params: {
           symbol: selectedSymbol,
           period: '1y',
           epochs: 30
         }
       });
+      await waitForJob(response.data.job_id);
       alert('Model refresh completed successfully');
     } catch (error) {
       console.error('Error refreshing model:', error);
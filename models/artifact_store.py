@@ -0,0 +1,124 @@
+"""
+Single-file model artifacts for Oasis
+Arrays and JSON metadata in one .npz, written atomically and content hashed
+"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+import numpy as np
+
+# Bumped whenever the layout of the arrays or metadata changes
+ARTIFACT_FORMAT = 1
+
+
+def _process_umask():
+    """The process umask; reading it means setting it, so this runs once at import"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# Mode of files created with open(), which mkstemp's private 0600 is changed to
+FILE_MODE = 0o666 & ~_process_umask()
+
+
+def content_hash(arrays):
+    """
+    SHA-256 over array names, dtypes, shapes and bytes, in name order
+
+    Args:
+        arrays (dict): Name -> ndarray
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def save_artifact(path, arrays, metadata):
+    """
+    Write arrays and metadata to one file, atomically
+
+    The file is written next to its destination and moved into place with
+    os.replace, so readers see either the old or the new artifact, never a
+    partly written one. It gets the permissions open() would give it, so
+    processes running as other users can still read it.
+
+    Args:
+        path (str): Destination file
+        arrays (dict): Name -> ndarray
+        metadata (dict): JSON-serializable metadata
+
+    Returns:
+        dict: The stored metadata, with format, version and content_hash added
+    """
+    metadata = dict(metadata)
+    metadata['format'] = ARTIFACT_FORMAT
+    metadata['version'] = time.time_ns()
+    metadata['content_hash'] = content_hash(arrays)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        os.fchmod(fd, FILE_MODE)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, __metadata__=np.array(json.dumps(metadata)), **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return metadata
+
+
+def read_metadata(path):
+    """
+    Read only the metadata of an artifact
+
+    Args:
+        path (str): Artifact file
+
+    Returns:
+        dict: Stored metadata
+    """
+    with np.load(path) as artifact:
+        return json.loads(str(artifact['__metadata__']))
+
+
+def load_artifact(path, names=None, verify=True):
+    """
+    Load an artifact from a single open of the file
+
+    Args:
+        path (str): Artifact file
+        names (list): Arrays to read; None reads all of them
+        verify (bool): Check the content hash (requires reading all arrays)
+
+    Returns:
+        tuple: (metadata, arrays)
+    """
+    with np.load(path) as artifact:
+        metadata = json.loads(str(artifact['__metadata__']))
+        if metadata.get('format', 0) > ARTIFACT_FORMAT:
+            raise ValueError(f"Artifact {path} has unsupported format {metadata['format']}")
+
+        stored = [name for name in artifact.files if name != '__metadata__']
+        if verify:
+            arrays = {name: artifact[name] for name in stored}
+            if content_hash(arrays) != metadata.get('content_hash'):
+                raise ValueError(f"Artifact {path} failed its content hash check")
+            if names is not None:
+                arrays = {name: arrays[name] for name in names if name in arrays}
+        else:
+            arrays = {name: artifact[name] for name in (stored if names is None else names) if name in stored}
+
+    return metadata, arrays
@@ -0,0 +1,250 @@
+"""
+Walk-forward backtesting for Oasis LSTM models
+Trains on an expanding window of history, scores the bars that follow it
+out of sample, then moves forward; independent stretches of folds run in
+parallel worker processes
+"""
+import os
+import sys
+import math
+import time
+import logging
+import tempfile
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def walk_forward_folds(rows, lookback_days, initial_bars=None, step=None, horizon=1):
+    """
+    Split a history into expanding-window folds
+
+    Fold k trains on rows [0, train_end) and is scored on the windows whose
+    targets all lie in [train_end, test_end); the next fold trains up to
+    that fold's test_end.
+
+    Args:
+        rows (int): Number of bars in the history
+        lookback_days (int): Number of days in each input window
+        initial_bars (int): Bars the first fold trains on
+            (defaults to BACKTEST_INITIAL_FRACTION of the history)
+        step (int): Bars scored per fold, i.e. how often the model is updated
+        horizon (int): Number of days the model predicts
+
+    Returns:
+        list: (train_end, test_end) row bounds of each fold
+    """
+    initial_bars = initial_bars or int(rows * float(os.getenv('BACKTEST_INITIAL_FRACTION', 0.5)))
+    step = step or int(os.getenv('BACKTEST_STEP', 21))
+    if initial_bars <= lookback_days + horizon:
+        raise ValueError(f"Need more than {lookback_days + horizon} bars to train the first fold, got {initial_bars}")
+
+    folds = []
+    train_end = initial_bars
+    while train_end + horizon <= rows:
+        test_end = min(train_end + step, rows)
+        folds.append((train_end, test_end))
+        train_end = test_end
+    return folds
+
+
+def _score_fold(predictor, lookback_days, train_end):
+    """
+    Score the windows whose targets lie after train_end, in one batched call
+
+    Returns:
+        dict: Fold metrics with the persistence baseline and prediction time
+    """
+    from models.lstm_predictor import make_windows
+
+    X, y = make_windows(predictor.scale_data(), lookback_days, predictor.horizon)
+    X, y = X[train_end - lookback_days:], y[train_end - lookback_days:]
+
+    start = time.perf_counter()
+    predictions = predictor._predict_scaled(X)
+    predict_seconds = time.perf_counter() - start
+
+    metrics = predictor._score(predictions, y)
+    # Repeating the last close is the bar a forecast has to clear
+    naive = predictor._score(np.broadcast_to(X[:, -1, :1], y.reshape(len(y), -1).shape), y)
+    metrics.update({
+        'naive_rmse': naive['rmse'],
+        'naive_mae': naive['mae'],
+        'test_windows': len(y),
+        'predict_seconds': predict_seconds
+    })
+    return metrics
+
+
+def _run_folds(symbol, period, horizon, config, data, folds, epochs, fine_tune_epochs, model_dir):
+    """
+    Run consecutive folds: a full retrain on the first, fine-tuning on the rest
+
+    Runs in a worker process, or inline when there is a single worker.
+
+    Returns:
+        list: Results of each fold
+    """
+    from models.lstm_predictor import LSTMPredictor
+
+    predictor = LSTMPredictor(symbol, period=period, model_dir=model_dir, horizon=horizon, config=config)
+    lookback_days = predictor.config['lookback_days']
+    results = []
+
+    for i, (train_end, test_end) in enumerate(folds):
+        predictor.data = data.iloc[:train_end]
+        start = time.perf_counter()
+        if i == 0:
+            predictor.model = None
+            predictor.train(epochs=epochs, lookback_days=lookback_days)
+            update = 'full'
+        else:
+            predictor.fine_tune(epochs=fine_tune_epochs)
+            update = 'incremental'
+        train_seconds = time.perf_counter() - start
+
+        # The fold's scaler and weights only ever saw bars before train_end
+        predictor.data = data.iloc[:test_end]
+        result = {
+            'train_start': data.index[0].isoformat(),
+            'train_end': data.index[train_end - 1].isoformat(),
+            'test_start': data.index[train_end].isoformat(),
+            'test_end': data.index[test_end - 1].isoformat(),
+            'train_bars': train_end,
+            'update': update,
+            'train_seconds': train_seconds
+        }
+        result.update(_score_fold(predictor, lookback_days, train_end))
+        results.append(result)
+    return results
+
+
+def walk_forward_backtest(symbol, period, data, horizon=1, config=None, initial_bars=None, step=None,
+                          retrain_every=None, epochs=None, fine_tune_epochs=None, workers=None):
+    """
+    Walk-forward backtest of a symbol's model
+
+    The model is updated every `step` bars: retrained from scratch on every
+    retrain_every-th fold and fine-tuned on the new bars in between, the way
+    LSTMPredictor.update() keeps a served model current. Each stretch that
+    starts with a full retrain is independent of the others and runs in its
+    own worker process. Every fold is scored out of sample in one batched
+    forward pass over all its test windows.
+
+    Args:
+        symbol (str): Stock or crypto symbol
+        period (str): Period of the data
+        data (DataFrame): Historical data as returned by LSTMPredictor.fetch_data()
+        horizon (int): Number of days the model predicts
+        config (dict): Hyperparameters overriding default_config()
+        initial_bars (int): Bars the first fold trains on
+        step (int): Bars scored per fold
+        retrain_every (int): Full retrain every this many folds, 1 retrains every fold
+        epochs (int): Epochs of a full retrain
+        fine_tune_epochs (int): Epochs of a fine-tune
+        workers (int): Number of worker processes, at most the training threads of the budget
+
+    Returns:
+        dict: 'folds' with each fold's bounds, update, timing and error
+            next to a persistence baseline, and 'summary' pooling them
+    """
+    from models.execution_config import training_pool
+    from models.lstm_predictor import default_config
+
+    config = {**default_config(), **(config or {})}
+    retrain_every = retrain_every or int(os.getenv('BACKTEST_RETRAIN_EVERY', 1))
+    epochs = epochs or int(os.getenv('BACKTEST_EPOCHS', 20))
+    fine_tune_epochs = fine_tune_epochs or int(os.getenv('FINE_TUNE_EPOCHS', 3))
+
+    folds = walk_forward_folds(len(data), config['lookback_days'], initial_bars, step, horizon)
+    stretches = [folds[i:i + retrain_every] for i in range(0, len(folds), retrain_every)]
+
+    workers = workers or int(os.getenv('BACKTEST_WORKERS', min(4, os.cpu_count() or 1)))
+    executor, workers, threads = training_pool(workers, len(stretches))
+    logger.info(f"Backtesting {symbol} over {len(folds)} folds in {len(stretches)} stretches "
+                f"with {workers} workers, {threads} threads each")
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as model_dir, executor:
+        # Each stretch only needs the bars up to its last test window
+        tasks = [
+            (symbol, period, horizon, config, data.iloc[:stretch[-1][1]], stretch, epochs, fine_tune_epochs, model_dir)
+            for stretch in stretches
+        ]
+        if workers == 1:
+            results = [_run_folds(*task) for task in tasks]
+        else:
+            futures = [executor.submit(_run_folds, *task) for task in tasks]
+            results = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - started
+
+    fold_results = []
+    for stretch_results in results:
+        for result in stretch_results:
+            result['fold'] = len(fold_results)
+            fold_results.append(result)
+
+    return {
+        'symbol': symbol,
+        'period': period,
+        'horizon': horizon,
+        'config': config,
+        'folds': fold_results,
+        'summary': summarize_folds(fold_results, wall_seconds)
+    }
+
+
+def summarize_folds(folds, wall_seconds=None):
+    """
+    Pool fold results into backtest-wide error and cost
+
+    Args:
+        folds (list): Fold results from walk_forward_backtest()
+        wall_seconds (float): Elapsed time of the whole backtest
+
+    Returns:
+        dict: Error over all test windows and time spent training and predicting
+    """
+    windows = sum(fold['test_windows'] for fold in folds)
+
+    def pooled(key, squared=False):
+        power = 2 if squared else 1
+        mean = sum(fold[key] ** power * fold['test_windows'] for fold in folds) / windows
+        return math.sqrt(mean) if squared else mean
+
+    predict_seconds = sum(fold['predict_seconds'] for fold in folds)
+    return {
+        'folds': len(folds),
+        'test_windows': windows,
+        'rmse': pooled('rmse', squared=True),
+        'mae': pooled('mae'),
+        'naive_rmse': pooled('naive_rmse', squared=True),
+        'naive_mae': pooled('naive_mae'),
+        'train_seconds': sum(fold['train_seconds'] for fold in folds),
+        'predict_seconds': predict_seconds,
+        'predict_ms_per_window': 1000 * predict_seconds / windows,
+        'wall_seconds': wall_seconds
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from models.lstm_predictor import LSTMPredictor
+
+    logging.basicConfig(level=logging.INFO)
+    symbol = sys.argv[1] if len(sys.argv) > 1 else 'TSLA'
+    predictor = LSTMPredictor(symbol, period='2y')
+    if predictor.fetch_data():
+        report = walk_forward_backtest(symbol, '2y', predictor.data)
+        for fold in report['folds']:
+            print(f"fold {fold['fold']:>2} {fold['test_start'][:10]}..{fold['test_end'][:10]} {fold['update']:<11} "
+                  f"train {fold['train_seconds']:6.1f}s rmse {fold['rmse']:8.4f} (naive {fold['naive_rmse']:8.4f})")
+        summary = report['summary']
+        print(f"RMSE {summary['rmse']:.4f} (naive {summary['naive_rmse']:.4f}), MAE {summary['mae']:.4f}, "
+              f"train {summary['train_seconds']:.1f}s, wall {summary['wall_seconds']:.1f}s, "
+              f"{summary['predict_ms_per_window']:.3f} ms per window")
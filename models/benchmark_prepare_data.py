@@ -0,0 +1,53 @@
+"""
+Benchmark for LSTMPredictor window construction
+Compares the old Python loop against the strided views used by prepare_data
+"""
+import sys
+import os
+import time
+import tracemalloc
+import numpy as np
+
+# Add the models directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.lstm_predictor import make_windows
+
+def loop_windows(values, lookback_days):
+    """Window construction as prepare_data did it before make_windows"""
+    X, y = [], []
+    for i in range(lookback_days, len(values)):
+        X.append(values[i-lookback_days:i])
+        y.append(values[i])
+    X, y = np.array(X), np.array(y)
+    return np.reshape(X, (X.shape[0], X.shape[1], 1)), y
+
+def measure(build, values, lookback_days):
+    """Return (seconds, peak bytes) for one window build"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = build(values, lookback_days)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, X
+
+def run_benchmark(sizes=(1000, 10000, 100000), lookback_days=60):
+    """Print window-build time and peak memory for each series length"""
+    print(f"Window construction benchmark (lookback {lookback_days})")
+    print("=" * 72)
+    print(f"{'rows':>8} {'loop time':>12} {'loop peak':>12} {'view time':>12} {'view peak':>12} {'speedup':>9}")
+
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        values = rng.random(size, dtype=np.float32)
+
+        loop_time, loop_peak, loop_X = measure(loop_windows, values, lookback_days)
+        view_time, view_peak, view_X = measure(make_windows, values, lookback_days)
+        assert np.array_equal(loop_X, view_X)
+
+        print(f"{size:>8} {loop_time * 1000:>10.2f}ms {loop_peak / 1e6:>10.2f}MB "
+              f"{view_time * 1000:>10.2f}ms {view_peak / 1e6:>10.2f}MB {loop_time / view_time:>8.0f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,85 @@
+"""
+Benchmark for LSTMPredictor training precisions
+Compares training throughput and accuracy of each precision against float32
+"""
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add the models directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.lstm_predictor import (LSTMPredictor, TRAINING_PRECISIONS, cpu_supports_bfloat16,
+                                   resolve_training_precision, split_validation)
+
+def synthetic_prices(rows, seed=0):
+    """Random-walk OHLCV bars, used when no symbol is given"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    index = pd.bdate_range('2015-01-01', periods=rows)
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(100000, 1000000, rows)
+    }, index=index)
+
+def train_once(data, precision, epochs, config):
+    """Train one model and return (precision trained in, seconds, epochs run, windows per epoch, metrics, val_loss)"""
+    import tensorflow as tf  # pylint: disable=import-error
+    tf.keras.utils.set_random_seed(0)
+
+    predictor = LSTMPredictor('BENCH', period='bench', config=config, training_precision=precision)
+    predictor.data = data
+    X, y = predictor.prepare_data(config['lookback_days'], refit=True)
+    assert X.dtype == np.float32 and y.dtype == np.float32, "training inputs must be float32"
+    windows = len(split_validation(X, y)[1])
+
+    start = time.perf_counter()
+    history = predictor.train(epochs=epochs)
+    elapsed = time.perf_counter() - start
+    return (predictor.training_precision, elapsed, len(history.epoch), windows, predictor.metrics,
+            min(history.history['val_loss']))
+
+def run_benchmark(data, epochs=10, config=None):
+    """
+    Print throughput and accuracy of each training precision
+
+    Precisions the CPU cannot run natively fall back to float32 when
+    training, so they are skipped rather than reported as a second float32 run.
+    """
+    config = {'units': 64, 'lookback_days': 60, 'batch_size': 64, **(config or {})}
+
+    # Train every mode for the same number of epochs
+    os.environ['EARLY_STOPPING_PATIENCE'] = str(epochs)
+    os.environ['TRAINING_TIME_BUDGET_SECONDS'] = '0'
+
+    print(f"Training precision benchmark ({len(data)} bars, {epochs} epochs, "
+          f"native bfloat16: {cpu_supports_bfloat16()})")
+    print("=" * 86)
+    print(f"{'precision':>16} {'time':>9} {'windows/s':>10} {'speedup':>8} {'rmse':>9} {'rmse delta':>11} {'val_loss':>10}")
+
+    baseline = None
+    for precision in TRAINING_PRECISIONS:
+        if resolve_training_precision(precision) != precision:
+            print(f"{precision:>16} skipped: not supported natively, training would fall back to float32")
+            continue
+
+        trained, elapsed, epochs_run, windows, metrics, val_loss = train_once(data, precision, epochs, config)
+        label = precision if trained == precision else f"{precision}->{trained}"
+        throughput = windows * epochs_run / elapsed
+        if baseline is None:
+            baseline = (throughput, metrics['rmse'])
+
+        print(f"{label:>16} {elapsed:>8.1f}s {throughput:>10.0f} {throughput / baseline[0]:>7.2f}x "
+              f"{metrics['rmse']:>9.4f} {metrics['rmse'] - baseline[1]:>+11.4f} {val_loss:>10.6f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        predictor = LSTMPredictor(sys.argv[1], period='5y')
+        if not predictor.fetch_data():
+            sys.exit(1)
+        data = predictor.data
+    else:
+        data = synthetic_prices(2000)
+    run_benchmark(data)
@@ -0,0 +1,93 @@
+"""
+tf.data input pipelines for Oasis models
+Windows are cut from the scaled series on the fly instead of materializing
+the full (samples, lookback, 1) tensor
+"""
+import os
+import glob
+import numpy as np
+# pylint: disable=import-error
+import tensorflow as tf
+# pylint: enable=import-error
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def window_dataset(values, lookback_days, start=0, end=None, symbol_id=None, horizon=1):
+    """
+    Unbatched dataset of (window, target) pairs over a series
+
+    Window i is values[i:i + lookback_days] with target values[i + lookback_days]
+    (or the next `horizon` values) of column 0, exactly as make_windows() builds them.
+
+    Args:
+        values (ndarray): Scaled series, 1-D or (rows, features) with the
+            predicted value in column 0
+        lookback_days (int): Number of days in each window
+        start (int): First window to include
+        end (int): Window to stop before; defaults to the last window
+        symbol_id (int): If given, inputs become (window, symbol_id) for the global model
+        horizon (int): Number of future values each window predicts
+
+    Returns:
+        tf.data.Dataset: Dataset of windows shaped (lookback_days, features)
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if horizon == 1:
+        targets = values[lookback_days:, 0]
+    else:
+        targets = np.lib.stride_tricks.sliding_window_view(values[lookback_days:, 0], horizon)
+    dataset = tf.keras.utils.timeseries_dataset_from_array(
+        values[:len(values) - horizon],
+        targets,
+        sequence_length=lookback_days,
+        batch_size=None,
+        start_index=start,
+        end_index=None if end is None else end + lookback_days - 1
+    )
+
+    if symbol_id is not None:
+        symbol = tf.constant([symbol_id], dtype=tf.int32)
+        dataset = dataset.map(lambda window, target: ((window, symbol), target))
+    return dataset
+
+
+def training_dataset(datasets, batch_size, shuffle=True, cache=None, name='windows'):
+    """
+    Combine window datasets into a cached, shuffled, batched and prefetched pipeline
+
+    Args:
+        datasets (list): Unbatched datasets from window_dataset()
+        batch_size (int): Batch size for training
+        shuffle (bool): Shuffle windows every epoch
+        cache (str): 'memory' keeps the windows in RAM after the first epoch, a
+            directory caches them on disk, 'none' cuts them anew every epoch
+            (defaults to TRAINING_DATASET_CACHE)
+        name (str): Name of the on-disk cache file, unique per model and split
+
+    Returns:
+        tf.data.Dataset: Batched dataset ready for model.fit()
+    """
+    dataset = datasets[0]
+    for other in datasets[1:]:
+        dataset = dataset.concatenate(other)
+
+    cache = cache or os.getenv('TRAINING_DATASET_CACHE', 'memory')
+    if cache == 'memory':
+        dataset = dataset.cache()
+    elif cache != 'none':
+        # A cache left by an earlier run holds windows of older data
+        os.makedirs(cache, exist_ok=True)
+        for stale in glob.glob(os.path.join(cache, f"{name}.*")):
+            os.remove(stale)
+        dataset = dataset.cache(os.path.join(cache, name))
+
+    if shuffle:
+        buffer_size = int(os.getenv('TRAINING_SHUFFLE_BUFFER', 10000))
+        dataset = dataset.shuffle(buffer_size, reshuffle_each_iteration=True)
+
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
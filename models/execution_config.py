@@ -0,0 +1,203 @@
+"""
+CPU execution budgets for Oasis
+Sizes the TensorFlow and BLAS thread pools of each process from a node-wide
+core budget, with separate limits for training and inference
+"""
+import os
+import sys
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # pragma: no cover - installed with scikit-learn
+    threadpool_limits = None
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# How each kind of process shares the node:
+#   api        - gunicorn worker serving /predict and training in the background
+#   training   - scheduler or search worker that only trains
+#   standalone - script or notebook that owns the whole budget
+ROLES = ('api', 'training', 'standalone')
+
+# Budget the current process was configured with
+_budget = None
+
+
+def available_cores():
+    """Cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux platforms
+        return os.cpu_count() or 1
+
+
+def process_cores(role='standalone'):
+    """
+    Share of CPU_CORE_BUDGET one process of a role may use
+
+    API workers and the scheduler split the budget evenly between them,
+    OASIS_PROCESSES of them in total (defaults to GUNICORN_WORKERS + 1).
+
+    Args:
+        role (str): One of ROLES
+
+    Returns:
+        int: Number of cores
+    """
+    budget = int(os.getenv('CPU_CORE_BUDGET', 0)) or available_cores()
+    if role == 'standalone':
+        return max(1, budget)
+
+    processes = int(os.getenv('OASIS_PROCESSES', 0)) or int(os.getenv('GUNICORN_WORKERS', 4)) + 1
+    return max(1, budget // processes)
+
+
+def thread_budget(role='standalone'):
+    """
+    Thread limits for a process of a role
+
+    In an API worker the share is split so that inference keeps its own
+    cores however many trainings run: INFERENCE_THREADS (half the share by
+    default) go to prediction and the rest to training, never more than the
+    share in total. A pool needs at least one thread, so a one-core share
+    cannot be split; there inference keeps the core and training gets a
+    single thread with no inter-op parallelism, taking turns with it.
+    Processes that only train, or own the machine, give both limits the
+    whole share. TRAINING_THREADS and INFERENCE_THREADS override the
+    computed values, within the share for API workers.
+
+    Args:
+        role (str): One of ROLES
+
+    Returns:
+        dict: 'training' and 'interop' threads for TensorFlow's pools,
+            'inference' threads for BLAS (the NumPy inference engine) and
+            the 'cores' of the share they were sized from
+    """
+    if role not in ROLES:
+        raise ValueError(f"Unknown execution role: {role}")
+
+    cores = process_cores(role)
+    training = int(os.getenv('TRAINING_THREADS', 0))
+    inference = int(os.getenv('INFERENCE_THREADS', 0))
+    if role == 'api':
+        if cores == 1:
+            inference = training = 1
+        else:
+            inference = min(inference or cores // 2, cores - 1)
+            training = min(training or cores - inference, cores - inference)
+    else:
+        training = training or cores
+        inference = inference or cores
+
+    interop = int(os.getenv('TRAINING_INTEROP_THREADS', 0)) or min(2, training)
+    if role == 'api' and cores == 1:
+        interop = 1
+    return {'role': role, 'cores': cores, 'training': training, 'inference': inference, 'interop': interop}
+
+
+def configure_process(role='standalone', training_threads=None, inference_threads=None):
+    """
+    Apply a thread budget to this process
+
+    TensorFlow reads its pool sizes when its runtime starts, so this should
+    run before the first model is built or loaded; it sets the environment
+    TensorFlow reads and, if TensorFlow is already imported, its threading
+    config too. Only the first call takes effect, so libraries can call it
+    unconditionally after the entry point has picked a role.
+
+    Keras models use the training pool for prediction as well; only the
+    NumPy inference engine runs on the separate inference budget.
+
+    Args:
+        role (str): One of ROLES
+        training_threads (int): Override the role's training threads
+        inference_threads (int): Override the role's inference threads
+
+    Returns:
+        dict: The budget in effect
+    """
+    global _budget
+    if _budget is not None:
+        return _budget
+
+    budget = thread_budget(role)
+    if training_threads:
+        budget['training'] = training_threads
+        budget['interop'] = min(budget['interop'], training_threads)
+    if inference_threads:
+        budget['inference'] = inference_threads
+
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(budget['training'])
+    os.environ['TF_NUM_INTEROP_THREADS'] = str(budget['interop'])
+    if 'tensorflow' in sys.modules:
+        _configure_tensorflow(budget)
+
+    if threadpool_limits is not None:
+        threadpool_limits(limits=budget['inference'], user_api='blas')
+
+    _budget = budget
+    if role == 'api' and budget['training'] + budget['inference'] > budget['cores']:
+        logger.warning(f"A {budget['cores']}-core share cannot keep training and inference apart; "
+                       f"raise CPU_CORE_BUDGET or lower OASIS_PROCESSES")
+    logger.info(f"Execution budget for {role} process: {budget['training']} training threads "
+                f"({budget['interop']} inter-op), {budget['inference']} inference threads")
+    return budget
+
+
+def _configure_tensorflow(budget):
+    """Set TensorFlow's pool sizes, if its runtime has not started yet"""
+    import tensorflow as tf  # pylint: disable=import-error
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(budget['training'])
+        tf.config.threading.set_inter_op_parallelism_threads(budget['interop'])
+    except RuntimeError:
+        logger.warning("TensorFlow is already running; its thread pools keep their current size")
+
+
+def current_budget():
+    """
+    Budget of this process, configuring it as standalone if no entry point did
+
+    Returns:
+        dict: See thread_budget()
+    """
+    return _budget or configure_process()
+
+
+def _init_training_worker(threads):
+    """Give a worker its slice of the training budget before it runs any op"""
+    configure_process('training', training_threads=threads, inference_threads=threads)
+
+
+def training_pool(workers, tasks=None):
+    """
+    Process pool for training work that runs in parallel with itself
+
+    Workers split this process's training budget, at least a thread each,
+    and configure their thread pools before running anything. TensorFlow is
+    not fork-safe, so workers are spawned fresh.
+
+    Args:
+        workers (int): Requested number of worker processes
+        tasks (int): Number of independent tasks, which also caps the workers
+
+    Returns:
+        tuple: (ProcessPoolExecutor, workers, threads per worker)
+    """
+    budget = current_budget()['training']
+    workers = max(1, min(workers, budget, tasks or workers))
+    threads = max(1, budget // workers)
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_training_worker, initargs=(threads,)
+    )
+    return executor, workers, threads
@@ -0,0 +1,190 @@
+"""
+Hyperparameter search for Oasis LSTM models
+Trains candidate configurations in parallel worker processes and prunes
+the weaker half (or more) after every rung, successive-halving style
+"""
+import os
+import sys
+import math
+import random
+import logging
+import tempfile
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Values tried for each hyperparameter
+DEFAULT_SEARCH_SPACE = {
+    'units': [32, 50, 64, 96],
+    'dropout': [0.1, 0.2, 0.3],
+    'learning_rate': [0.0005, 0.001, 0.003],
+    'batch_size': [16, 32, 64],
+    'lookback_days': [30, 60, 90]
+}
+
+
+def sample_configs(space, count, seed=None):
+    """
+    Draw distinct configurations from a search space
+
+    Args:
+        space (dict): Hyperparameter name -> list of values
+        count (int): Number of configurations to draw
+        seed (int): Random seed
+
+    Returns:
+        list: Configurations as dicts
+    """
+    rng = random.Random(seed)
+    names = sorted(space)
+    total = math.prod(len(space[name]) for name in names)
+    count = min(count, total)
+
+    configs, seen = [], set()
+    while len(configs) < count:
+        values = tuple(rng.choice(space[name]) for name in names)
+        if values not in seen:
+            seen.add(values)
+            configs.append(dict(zip(names, values)))
+    return configs
+
+
+def _train_candidate(symbol, period, horizon, data, config, epochs, weights_path):
+    """
+    Train one candidate for a number of epochs, resuming from its last rung
+
+    Runs in a worker process.
+
+    Returns:
+        float: Validation loss (scaled MSE) of the weights the candidate continues from
+    """
+    from models.lstm_predictor import LSTMPredictor, split_validation
+
+    predictor = LSTMPredictor(symbol, period=period, model_dir=os.path.dirname(weights_path),
+                              horizon=horizon, config=config)
+    predictor.data = data
+    lookback_days = config['lookback_days']
+
+    X, y = predictor.prepare_data(lookback_days, refit=True)
+    X_train, y_train, validation_data = split_validation(X, y)
+    if validation_data is None:
+        raise ValueError(f"Not enough data to validate lookback {lookback_days}")
+
+    predictor.build_model(lookback_days)
+    if os.path.exists(weights_path):
+        predictor.model.load_weights(weights_path)
+
+    history = predictor.model.fit(
+        X_train, y_train,
+        validation_data=validation_data,
+        epochs=epochs,
+        batch_size=config['batch_size'],
+        verbose=0
+    )
+    predictor.model.save_weights(weights_path)
+    return float(history.history['val_loss'][-1])
+
+
+def search_hyperparameters(symbol, period, data, horizon=1, space=None, candidates=None,
+                           min_epochs=None, max_epochs=None, eta=None, workers=None, seed=None):
+    """
+    Search for the best configuration of a symbol's model
+
+    Every candidate trains for min_epochs in the first rung; after each rung
+    only the best 1/eta of them go on, training eta times as many epochs in
+    total, until one is left or max_epochs is reached. Candidates continue
+    from the weights of their previous rung.
+
+    Args:
+        symbol (str): Stock or crypto symbol
+        period (str): Period of the data
+        data (DataFrame): Historical data as returned by LSTMPredictor.fetch_data()
+        horizon (int): Number of days the model predicts
+        space (dict): Search space, defaults to DEFAULT_SEARCH_SPACE
+        candidates (int): Number of configurations to try
+        min_epochs (int): Epochs of the first rung
+        max_epochs (int): Total epochs of the last rung
+        eta (int): Pruning factor between rungs
+        workers (int): Number of worker processes, at most the training threads of the budget
+        seed (int): Random seed for sampling configurations
+
+    Returns:
+        tuple: (best config, trials) where trials lists each candidate's
+            config, validation loss, epochs trained and rung reached
+    """
+    from models.execution_config import training_pool
+
+    space = space or DEFAULT_SEARCH_SPACE
+    candidates = candidates or int(os.getenv('HPARAM_SEARCH_CANDIDATES', 9))
+    min_epochs = min_epochs or int(os.getenv('HPARAM_SEARCH_MIN_EPOCHS', 3))
+    max_epochs = max_epochs or int(os.getenv('HPARAM_SEARCH_MAX_EPOCHS', 27))
+    eta = eta or int(os.getenv('HPARAM_SEARCH_ETA', 3))
+    workers = workers or int(os.getenv('HPARAM_SEARCH_WORKERS', min(4, os.cpu_count() or 1)))
+
+    executor, workers, threads = training_pool(workers)
+
+    trials = [
+        {'config': config, 'val_loss': None, 'epochs': 0, 'rung': 0}
+        for config in sample_configs(space, candidates, seed)
+    ]
+    logger.info(f"Searching {len(trials)} configurations for {symbol} with {workers} workers, "
+                f"{threads} threads each")
+
+    with tempfile.TemporaryDirectory() as work_dir, executor:
+        survivors = list(range(len(trials)))
+        rung, budget = 0, min_epochs
+
+        while survivors:
+            futures = {}
+            for i in survivors:
+                trial = trials[i]
+                futures[i] = executor.submit(
+                    _train_candidate, symbol, period, horizon, data, trial['config'],
+                    budget - trial['epochs'], os.path.join(work_dir, f"candidate_{i}.weights.h5")
+                )
+
+            for i, future in futures.items():
+                trial = trials[i]
+                try:
+                    trial['val_loss'] = future.result()
+                except Exception as e:
+                    logger.warning(f"Candidate {trial['config']} failed: {e}")
+                    trial['val_loss'] = float('inf')
+                trial['epochs'] = budget
+                trial['rung'] = rung
+
+            ranked = sorted(survivors, key=lambda i: trials[i]['val_loss'])
+            logger.info(f"Rung {rung} ({budget} epochs): best val_loss {trials[ranked[0]]['val_loss']:.6f}")
+
+            keep = len(ranked) // eta
+            if keep < 1 or budget >= max_epochs:
+                break
+            survivors = [i for i in ranked[:keep] if math.isfinite(trials[i]['val_loss'])]
+            rung, budget = rung + 1, min(budget * eta, max_epochs)
+
+    finished = [trial for trial in trials if trial['val_loss'] is not None and math.isfinite(trial['val_loss'])]
+    if not finished:
+        raise ValueError(f"Every candidate configuration failed for {symbol}")
+
+    # Prefer candidates that survived the most rungs, then the lowest loss
+    best = min(finished, key=lambda trial: (-trial['rung'], trial['val_loss']))
+    logger.info(f"Best configuration for {symbol}: {best['config']} (val_loss {best['val_loss']:.6f})")
+    return best['config'], trials
+
+
+# Example usage
+if __name__ == "__main__":
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from models.lstm_predictor import LSTMPredictor
+
+    logging.basicConfig(level=logging.INFO)
+    symbol = sys.argv[1] if len(sys.argv) > 1 else 'TSLA'
+    predictor = LSTMPredictor(symbol, period='2y')
+    if predictor.fetch_data():
+        config, trials = search_hyperparameters(symbol, '2y', predictor.data)
+        for trial in sorted(trials, key=lambda trial: (-trial['rung'], trial['val_loss'])):
+            print(f"rung {trial['rung']} epochs {trial['epochs']:>3} val_loss {trial['val_loss']:.6f} {trial['config']}")
+        print(f"Best configuration: {config}")
@@ -1,17 +1,21 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import yfinance as yf
 from sklearn.preprocessing import MinMaxScaler
-# pylint: disable=import-error
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from tensorflow.keras.optimizers import Adam
-# pylint: enable=import-error
+
+from data.feature_store import feature_columns, feature_store
+from models.artifact_store import load_artifact, read_metadata, save_artifact
+from models.execution_config import configure_process
+from models.numpy_inference import NumpyLSTMEngine
 
 import warnings
 import os
+import json
 import pickle
 import logging
+from functools import lru_cache
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,8 +27,153 @@ logger = logging.getLogger(__name__)
 
 warnings.filterwarnings('ignore')
 
+# Fitted MinMaxScaler state stored in model artifacts
+SCALER_ATTRIBUTES = ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_', 'n_samples_seen_', 'n_features_in_')
+
+# Compute precisions build_model() supports; weights are kept in float32 either way
+TRAINING_PRECISIONS = ('float32', 'mixed_bfloat16')
+
+@lru_cache(maxsize=None)
+def cpu_supports_bfloat16():
+    """Whether the CPU has native bfloat16 instructions (AVX512-BF16 or AMX)"""
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+def resolve_training_precision(precision=None):
+    """
+    Compute precision to train with
+    
+    Mixed bfloat16 runs matrix math in bfloat16 and keeps weights, the
+    output layer and the loss in float32. Without native bfloat16 support
+    it is emulated and slower than float32, so float32 is used instead.
+    
+    Args:
+        precision (str): One of TRAINING_PRECISIONS (defaults to TRAINING_PRECISION)
+        
+    Returns:
+        str: The precision to use
+    """
+    precision = precision or os.getenv('TRAINING_PRECISION', 'float32')
+    if precision not in TRAINING_PRECISIONS:
+        raise ValueError(f"Unsupported training precision: {precision}")
+    if precision == 'mixed_bfloat16' and not cpu_supports_bfloat16():
+        logger.warning("CPU has no native bfloat16 support, training in float32")
+        return 'float32'
+    return precision
+
+def scaler_arrays(scaler, prefix):
+    """Fitted state of a MinMaxScaler as named arrays"""
+    return {f'{prefix}{name}': np.asarray(getattr(scaler, name)) for name in SCALER_ATTRIBUTES}
+
+def restore_scaler(arrays, prefix, feature_range):
+    """Rebuild a fitted MinMaxScaler from scaler_arrays() output"""
+    scaler = MinMaxScaler(feature_range=feature_range)
+    for name in SCALER_ATTRIBUTES:
+        value = arrays[f'{prefix}{name}']
+        setattr(scaler, name, value.item() if value.ndim == 0 else value)
+    return scaler
+
+def make_windows(values, lookback_days, horizon=1):
+    """
+    Build LSTM training windows over a series without copying it
+    
+    Window i is values[i:i + lookback_days] and its target is the first
+    column of values[i + lookback_days], or of the next `horizon` rows for
+    a multi-horizon model. Both are strided, read-only views.
+    
+    Args:
+        values (ndarray): Scaled series, 1-D or (rows, features) with the
+            predicted value in column 0
+        lookback_days (int): Number of days in each window
+        horizon (int): Number of future values each window predicts
+        
+    Returns:
+        tuple: (X, y) with X shaped [samples, time steps, features] and y
+            shaped [samples] (horizon 1) or [samples, horizon]
+    """
+    if len(values) < lookback_days + horizon:
+        raise ValueError(f"Not enough data to build windows. Need at least {lookback_days + horizon} days.")
+        
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    X = sliding_window_view(values[:len(values) - horizon], lookback_days, axis=0).swapaxes(1, 2)
+    targets = values[:, 0]
+    if horizon == 1:
+        y = targets[lookback_days:]
+    else:
+        y = sliding_window_view(targets[lookback_days:], horizon)
+    return X, y
+
+def artifact_file(model_dir, model_key):
+    """Path of a model's single-file artifact"""
+    return os.path.join(model_dir, f"{model_key}.model.npz")
+
+def legacy_artifact_files(model_dir, model_key):
+    """Paths of a model's (model, scaler) files written before single-file artifacts"""
+    return (os.path.join(model_dir, f"{model_key}.h5"),
+            os.path.join(model_dir, f"{model_key}_scaler.npy"))
+
+def default_config():
+    """
+    Default hyperparameters of the per-symbol LSTM
+    
+    Returns:
+        dict: units, dropout, learning_rate, batch_size, lookback_days and
+            the input features (see data.feature_store)
+    """
+    return {
+        'units': 50,
+        'dropout': 0.2,
+        'learning_rate': 0.001,
+        'batch_size': int(os.getenv('DEFAULT_BATCH_SIZE', 32)),
+        'lookback_days': int(os.getenv('DEFAULT_LOOKBACK_DAYS', 60)),
+        'features': os.getenv('DEFAULT_FEATURES', 'Close').split(',')
+    }
+
+def validation_size(samples, validation_split=None):
+    """
+    Number of most recent windows to hold out for validation
+    
+    Args:
+        samples (int): Number of windows
+        validation_split (float): Fraction held out (defaults to VALIDATION_SPLIT)
+        
+    Returns:
+        int: Holdout size, 0 if the holdout or the training part would be empty
+    """
+    if validation_split is None:
+        validation_split = float(os.getenv('VALIDATION_SPLIT', 0.1))
+        
+    holdout = int(samples * validation_split)
+    return holdout if 0 < holdout < samples else 0
+
+def split_validation(X, y, validation_split=None):
+    """
+    Hold out the most recent windows for validation
+    
+    The split is chronological so the model is validated on bars after the
+    ones it was fitted on. Both parts are views, nothing is copied.
+    
+    Args:
+        X (ndarray): Windows in time order
+        y (ndarray): Targets of the windows
+        validation_split (float): Fraction held out (defaults to VALIDATION_SPLIT)
+        
+    Returns:
+        tuple: (X_train, y_train, validation_data) where validation_data is
+            None if the holdout would be empty
+    """
+    holdout = validation_size(len(y), validation_split)
+    if not holdout:
+        return X, y, None
+    return X[:-holdout], y[:-holdout], (X[-holdout:], y[-holdout:])
+
 class LSTMPredictor:
-    def __init__(self, symbol, period='2y', model_dir=None):
+    def __init__(self, symbol, period='2y', model_dir=None, horizon=1, config=None, training_precision=None):
         """
         Initialize the Oasis LSTM Predictor
         
@@ -32,62 +181,239 @@ class LSTMPredictor:
             symbol (str): Stock or crypto symbol (e.g., 'AAPL', 'BTC-USD')
             period (str): Period for historical data ('1y', '2y', etc.)
             model_dir (str): Directory to save/load models
+            horizon (int): Number of future days predicted in one forward pass
+            config (dict): Hyperparameters overriding default_config()
+            training_precision (str): Compute precision of training, one of
+                TRAINING_PRECISIONS (defaults to TRAINING_PRECISION)
         """
+        if horizon < 1:
+            raise ValueError(f"Horizon must be at least 1, got {horizon}")
+            
         self.symbol = symbol
         self.period = period
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        self.horizon = horizon
+        self.config = {**default_config(), **(config or {})}
+        self.training_precision = training_precision
+        self.scaler = MinMaxScaler(feature_range=(0, 1))  # closing prices, the predicted value
+        self.feature_scaler = MinMaxScaler(feature_range=(0, 1))  # every other input feature
         self.model = None
+        self.engine = None
         self.data = None
         self.scaled_data = None
+        self.observed_min = float('inf')
+        self.observed_max = float('-inf')
+        self.lookback_days = None
+        self.metrics = None
+        self.trained_at = None
+        self.last_full_train = None
+        self.last_trained_bar = None
+        self.artifact_version = None
+        self.content_hash = None
         self.model_dir = model_dir or os.getenv('MODEL_DIR', 'models')
         
         # Create model directory if it doesn't exist
         if not os.path.exists(self.model_dir):
             os.makedirs(self.model_dir)
         
-    def fetch_data(self):
+        # Size thread pools before the first model is built (no-op once the entry point has)
+        configure_process()
+        
+    @property
+    def model_key(self):
+        """Key identifying this model in registries and on disk"""
+        if self.horizon == 1:
+            return f"{self.symbol}_{self.period}"
+        return f"{self.symbol}_{self.period}_h{self.horizon}"
+        
+    @property
+    def feature_names(self):
+        """Input features of the model, the close first"""
+        return feature_columns(self.config['features'])
+        
+    def fetch_data(self, data_handler=None):
         """
         Fetch historical data using yfinance
+        
+        Args:
+            data_handler (DataHandler): Read the bars through this local store
+                instead, requesting only ranges it has never fetched upstream
         """
         try:
             logger.info(f"Fetching data for {self.symbol} with period {self.period}")
-            ticker = yf.Ticker(self.symbol)
-            self.data = ticker.history(period=self.period)
+            if data_handler is not None:
+                self.data = data_handler.get_price_history(self.symbol, self.period)
+            else:
+                ticker = yf.Ticker(self.symbol)
+                self.data = ticker.history(period=self.period)
+            self.scaled_data = None
             logger.info(f"Fetched {len(self.data)} records for {self.symbol}")
             return True
         except Exception as e:
             logger.error(f"Error fetching data for {self.symbol}: {e}")
             return False
     
-    def prepare_data(self, lookback_days=60):
+    @property
+    def scaled_data(self):
+        """Scaled features, shape (rows, features) with the close in column 0, as a view of the scaled buffer"""
+        if self._scaled_buffer is None:
+            return None
+        return self._scaled_buffer[:self._scaled_count]
+    
+    @scaled_data.setter
+    def scaled_data(self, value):
+        if value is None:
+            self._scaled_buffer = None
+            self._scaled_count = 0
+        else:
+            value = np.asarray(value, dtype=np.float32)
+            self._scaled_buffer = value.reshape(-1, 1) if value.ndim == 1 else value
+            self._scaled_count = len(self._scaled_buffer)
+    
+    @property
+    def scaler_fitted(self):
+        """Whether the scaler has been fitted or loaded"""
+        return hasattr(self.scaler, 'data_min_')
+    
+    @property
+    def feature_key(self):
+        """Feature store key of the price history, shared by every horizon of a symbol and period"""
+        return f"{self.symbol}_{self.period}"
+    
+    def _features(self, start=0, changed=None):
         """
-        Prepare data for LSTM training
+        Raw features from row `start` on, as float32 (rows, features) with the close first
+        
+        Features come from the shared feature store, which computes only bars
+        it has not seen, or bars from `changed` on.
+        """
+        return feature_store.features(self.feature_key, self.feature_names, self.data, start, changed)
+    
+    def _append_scaled(self, features):
+        """
+        Scale raw features and append them to the scaled buffer
+        
+        The buffer grows geometrically, so appending a bar is amortized O(1).
+        """
+        close_prices = features[:, :1]
+        rows = self.scaler.transform(close_prices)
+        if features.shape[1] > 1:
+            rows = np.hstack([rows, self.feature_scaler.transform(features[:, 1:])])
+        needed = self._scaled_count + len(rows)
+        if self._scaled_buffer is None or needed > len(self._scaled_buffer):
+            capacity = max(needed, 2 * self._scaled_count, 256)
+            buffer = np.empty((capacity, rows.shape[1]), dtype=np.float32)
+            if self._scaled_buffer is not None:
+                buffer[:self._scaled_count] = self._scaled_buffer[:self._scaled_count]
+            self._scaled_buffer = buffer
+            
+        self._scaled_buffer[self._scaled_count:needed] = rows
+        self._scaled_count = needed
+        
+        # Track the raw price range seen since the scaler was fitted
+        if len(close_prices):
+            self.observed_min = min(self.observed_min, float(close_prices.min()))
+            self.observed_max = max(self.observed_max, float(close_prices.max()))
+    
+    def fit_scaler(self):
+        """
+        Fit the scalers on the fetched features and scale all of them
+        
+        Returns:
+            ndarray: Scaled features
+        """
+        if self.data is None:
+            raise ValueError("No data available. Call fetch_data() first.")
+            
+        features = self._features()
+        self.scaler.fit(features[:, :1])
+        if features.shape[1] > 1:
+            self.feature_scaler.fit(features[:, 1:])
+        self.observed_min = float('inf')
+        self.observed_max = float('-inf')
+        
+        self.scaled_data = None
+        self._append_scaled(features)
+        
+        return self.scaled_data
+    
+    def scale_data(self, start=None):
+        """
+        Scale fetched features with the already fitted scalers
+        
+        Only rows that are not scaled yet (or rows from `start` on) are
+        computed and transformed, so appending bars costs time proportional
+        to the new bars rather than the whole history. Used after
+        load_model() so inference sees the same scale as training.
         
         Args:
-            lookback_days (int): Number of days to look back for prediction
+            start (int): First row whose bar is new or changed; defaults to
+                the first unscaled row
+            
+        Returns:
+            ndarray: Scaled features
         """
         if self.data is None:
             raise ValueError("No data available. Call fetch_data() first.")
             
-        # Use closing prices for prediction
-        close_prices = self.data['Close'].values
-        close_prices = np.array(close_prices).reshape(-1, 1)
+        if not self.scaler_fitted:
+            return self.fit_scaler()
+            
+        changed = start
+        start = self._scaled_count if start is None else min(start, self._scaled_count)
+        self._scaled_count = start
+        
+        features = self._features(start, changed)
+        if len(features):
+            self._append_scaled(features)
         
-        # Scale the data
-        self.scaled_data = self.scaler.fit_transform(close_prices)
+        return self.scaled_data
+    
+    def append_data(self, new_data):
+        """
+        Append newly arrived bars and scale only those
         
-        # Create sequences for training
-        X, y = [], []
-        for i in range(lookback_days, len(self.scaled_data)):
-            X.append(self.scaled_data[i-lookback_days:i, 0])
-            y.append(self.scaled_data[i, 0])
+        Bars whose dates are already present replace the stored ones, so the
+        latest (possibly still forming) bar can be refreshed.
+        
+        Args:
+            new_data (DataFrame): Bars in the same format as fetch_data()
+            
+        Returns:
+            ndarray: Scaled closing prices
+        """
+        if new_data is None or new_data.empty:
+            return self.scaled_data
+            
+        if self.data is None:
+            self.data = new_data
+            return self.scale_data()
             
-        X, y = np.array(X), np.array(y)
+        keep = self.data[self.data.index < new_data.index.min()]
+        self.data = pd.concat([keep, new_data])
+        
+        return self.scale_data(start=len(keep))
+    
+    def prepare_data(self, lookback_days=60, refit=False):
+        """
+        Prepare data for LSTM training
+        
+        The scaler is fitted once; later calls only scale bars appended since
+        and never change the scale the model was trained with.
         
-        # Reshape X for LSTM input [samples, time steps, features]
-        X = np.reshape(X, (X.shape[0], X.shape[1], 1))
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+            refit (bool): Refit the scaler on all fetched data
+        """
+        if self.data is None:
+            raise ValueError("No data available. Call fetch_data() first.")
+            
+        if refit or not self.scaler_fitted:
+            self.fit_scaler()
+        else:
+            self.scale_data()
         
-        return X, y
+        # Create sequences for training as views over the scaled data
+        return make_windows(self.scaled_data, lookback_days, self.horizon)
     
     def build_model(self, lookback_days=60):
         """
@@ -96,28 +422,46 @@ class LSTMPredictor:
         Args:
             lookback_days (int): Number of days to look back for prediction
         """
+        # TensorFlow is imported on demand so NumPy-only serving never loads it
+        # pylint: disable=import-error
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Dropout
+        # pylint: enable=import-error
+        
+        units = self.config['units']
+        dropout = self.config['dropout']
+        self.training_precision = resolve_training_precision(self.training_precision)
+        dtype = None if self.training_precision == 'float32' else self.training_precision
         self.model = Sequential()
         
         # First LSTM layer
-        self.model.add(LSTM(units=50, return_sequences=True, input_shape=(lookback_days, 1)))
-        self.model.add(Dropout(0.2))
+        self.model.add(LSTM(units=units, return_sequences=True, input_shape=(lookback_days, len(self.feature_names)),
+                            dtype=dtype))
+        self.model.add(Dropout(dropout, dtype=dtype))
         
         # Second LSTM layer
-        self.model.add(LSTM(units=50, return_sequences=True))
-        self.model.add(Dropout(0.2))
+        self.model.add(LSTM(units=units, return_sequences=True, dtype=dtype))
+        self.model.add(Dropout(dropout, dtype=dtype))
         
         # Third LSTM layer
-        self.model.add(LSTM(units=50, return_sequences=False))
-        self.model.add(Dropout(0.2))
+        self.model.add(LSTM(units=units, return_sequences=False, dtype=dtype))
+        self.model.add(Dropout(dropout, dtype=dtype))
         
-        # Output layer
-        self.model.add(Dense(units=1))
+        # Output layer, one unit per predicted day, in float32 under any precision
+        self.model.add(Dense(units=self.horizon, dtype='float32'))
         
-        # Compile the model
-        self.model.compile(optimizer=Adam(learning_rate=0.001), loss='mean_squared_error')
+        self.compile_model()
         
         return self.model
     
+    def compile_model(self):
+        """
+        Compile the model with a fresh optimizer
+        """
+        from tensorflow.keras.optimizers import Adam  # pylint: disable=import-error
+        
+        self.model.compile(optimizer=Adam(learning_rate=self.config['learning_rate']), loss='mean_squared_error')
+    
     def train(self, epochs=None, batch_size=None, lookback_days=None):
         """
         Train the LSTM model
@@ -127,48 +471,237 @@ class LSTMPredictor:
             batch_size (int): Batch size for training
             lookback_days (int): Number of days to look back for prediction
         """
-        # Use environment variables for defaults
+        # Use environment variables and the predictor's config for defaults
         epochs = epochs or int(os.getenv('DEFAULT_EPOCHS', 50))
-        batch_size = batch_size or int(os.getenv('DEFAULT_BATCH_SIZE', 32))
-        lookback_days = lookback_days or int(os.getenv('DEFAULT_LOOKBACK_DAYS', 60))
+        batch_size = batch_size or self.config['batch_size']
+        lookback_days = lookback_days or self.config['lookback_days']
+        
+        from models.training_callbacks import epoch_budget, training_callbacks
+        epochs = epoch_budget(epochs)
         
-        logger.info(f"Training model for {self.symbol} with {epochs} epochs, batch size {batch_size}, lookback {lookback_days}")
+        logger.info(f"Training model for {self.symbol} with up to {epochs} epochs, batch size {batch_size}, lookback {lookback_days}")
         
         if self.data is None:
             logger.info("Fetching data before training")
             self.fetch_data()
             
-        X, y = self.prepare_data(lookback_days)
+        # A new model gets a freshly fitted scaler; a trained one keeps its scale
+        X, y = self.prepare_data(lookback_days, refit=self.model is None)
         
-        if self.model is None:
+        from_scratch = self.model is None
+        if from_scratch:
             logger.info("Building model")
             self.build_model(lookback_days)
         
-        # Train the model
+        # Windows come either from in-memory views or from a tf.data pipeline
+        if os.getenv('TRAINING_INPUT_PIPELINE', 'numpy') == 'dataset':
+            train_data, validation_data = self.make_datasets(lookback_days, batch_size)
+            inputs = {'x': train_data}
+        else:
+            X_train, y_train, validation_data = split_validation(X, y)
+            inputs = {'x': X_train, 'y': y_train, 'batch_size': batch_size}
+        
+        # Train the model, stopping early once the validation loss stops improving
         logger.info("Starting model training")
         history = self.model.fit(
-            X, y,
+            **inputs,
+            validation_data=validation_data,
             epochs=epochs,
-            batch_size=batch_size,
+            callbacks=training_callbacks(validation=validation_data is not None),
             verbose=0
         )
-        logger.info("Model training completed")
+        logger.info(f"Model training completed after {len(history.epoch)} epochs")
+        
+        self._finish_training(lookback_days)
+        if from_scratch:
+            self.last_full_train = self.trained_at
         
         return history
     
-    def predict_next_day(self, lookback_days=60):
+    def make_datasets(self, lookback_days, batch_size, validation_split=None):
         """
-        Predict the next day's closing price
+        Build tf.data pipelines that cut windows from the scaled series on the fly
         
         Args:
             lookback_days (int): Number of days to look back for prediction
+            batch_size (int): Batch size for training
+            validation_split (float): Fraction of the most recent windows held out
             
         Returns:
-            float: Predicted next day closing price
+            tuple: (train_dataset, validation_dataset), the latter None without a holdout
+        """
+        from models.datasets import training_dataset, window_dataset
+        
+        values = self.scaled_data
+        samples = len(values) - lookback_days - self.horizon + 1
+        holdout = validation_size(samples, validation_split)
+        
+        train_data = training_dataset(
+            [window_dataset(values, lookback_days, end=samples - holdout, horizon=self.horizon)],
+            batch_size, name=f"{self.model_key}_train"
+        )
+        validation_data = None
+        if holdout:
+            validation_data = training_dataset(
+                [window_dataset(values, lookback_days, start=samples - holdout, horizon=self.horizon)],
+                batch_size, shuffle=False, name=f"{self.model_key}_validation"
+            )
+        return train_data, validation_data
+    
+    def _finish_training(self, lookback_days):
+        """Record what the model was trained on and compute its metrics"""
+        self.lookback_days = lookback_days
+        self.trained_at = datetime.now().isoformat()
+        self.last_trained_bar = self.data.index[-1].isoformat()
+        
+        # Any exported engine holds the old weights
+        self.engine = None
+        
+        # Metrics only change when the model does, so compute them once here
+        self.metrics = self.evaluate_model(lookback_days)
+        logger.info(f"Model metrics - RMSE: {self.metrics['rmse']:.4f}, MAE: {self.metrics['mae']:.4f}")
+        
+        precision = os.getenv('MODEL_PRECISION', 'float32')
+        if precision != 'float32':
+            self.metrics['quantized'] = self.evaluate_quantized(precision, lookback_days)
+            
+        if os.getenv('INFERENCE_BACKEND', 'keras') == 'numpy':
+            self.export_engine()
+    
+    def new_bar_count(self):
+        """
+        Number of fetched bars after the last bar the model was trained on
+        
+        Returns:
+            int: Count of new bars, or None if the training watermark is unknown
+        """
+        if self.data is None or self.last_trained_bar is None:
+            return None
+        return int((self.data.index > pd.Timestamp(self.last_trained_bar)).sum())
+    
+    def detect_drift(self, tolerance=None):
+        """
+        Check whether prices moved outside the range the scaler was fitted on
+        
+        Args:
+            tolerance (float): Allowed overshoot as a fraction of the fitted range
+            
+        Returns:
+            bool: True if observed prices exceed the fitted range by more than tolerance
+        """
+        if not self.scaler_fitted or self.observed_min > self.observed_max:
+            return False
+            
+        tolerance = tolerance if tolerance is not None else float(os.getenv('DRIFT_TOLERANCE', 0.1))
+        fitted_min = float(self.scaler.data_min_[0])
+        fitted_max = float(self.scaler.data_max_[0])
+        margin = (fitted_max - fitted_min) * tolerance
+        
+        return self.observed_min < fitted_min - margin or self.observed_max > fitted_max + margin
+    
+    def fine_tune(self, epochs=None, batch_size=None):
+        """
+        Continue training the current model on bars that arrived since it was trained
+        
+        Only windows ending in new bars are fitted, topped up with the most
+        recent older windows to fill at least one batch. The scaler is kept.
+        
+        Args:
+            epochs (int): Number of fine-tuning epochs
+            batch_size (int): Batch size for training
+            
+        Returns:
+            History: Keras training history, or None if there were no new bars
         """
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
             
+        from models.training_callbacks import epoch_budget, training_callbacks
+        
+        epochs = epoch_budget(epochs or int(os.getenv('FINE_TUNE_EPOCHS', 3)))
+        batch_size = batch_size or self.config['batch_size']
+        lookback_days = self.lookback_days or self.config['lookback_days']
+        
+        new_bars = self.new_bar_count()
+        if not new_bars:
+            logger.info(f"No new bars for {self.symbol}, skipping fine-tuning")
+            return None
+            
+        X, y = self.prepare_data(lookback_days)
+        samples = min(len(X), max(new_bars, batch_size))
+        
+        logger.info(f"Fine-tuning model for {self.symbol} on {new_bars} new bars ({samples} windows, {epochs} epochs)")
+        # Too few windows for a holdout, so only the time budget applies
+        history = self.model.fit(
+            X[-samples:], y[-samples:],
+            epochs=epochs,
+            batch_size=batch_size,
+            callbacks=training_callbacks(validation=False, early_stopping=False),
+            verbose=0
+        )
+        logger.info("Model fine-tuning completed")
+        
+        self._finish_training(lookback_days)
+        
+        return history
+    
+    def update(self, mode='auto', epochs=None, fine_tune_epochs=None, full_retrain_days=None):
+        """
+        Bring the model up to date with the fetched data
+        
+        In 'auto' mode an existing model is fine-tuned on the new bars; a full
+        retrain from random weights happens when there is no model or training
+        watermark, when prices drifted outside the scaler's range, or when the
+        last full retrain is older than full_retrain_days.
+        
+        Args:
+            mode (str): 'auto', 'incremental' or 'full'
+            epochs (int): Epochs for a full retrain
+            fine_tune_epochs (int): Epochs for fine-tuning
+            full_retrain_days (int): Maximum age of a full retrain in days
+            
+        Returns:
+            str: What was done: 'full', 'incremental' or 'none'
+        """
+        if mode not in ('auto', 'incremental', 'full'):
+            raise ValueError(f"Unsupported update mode: {mode}")
+            
+        if self.data is None:
+            self.fetch_data()
+            
+        full_retrain_days = full_retrain_days or int(os.getenv('FULL_RETRAIN_DAYS', 7))
+        
+        if mode == 'auto' and self.model is not None and self.last_trained_bar is not None:
+            # Scale the new bars first so observed prices include them
+            self.scale_data()
+            last_full = datetime.fromisoformat(self.last_full_train or self.trained_at)
+            if self.detect_drift():
+                logger.info(f"Price drift detected for {self.symbol}, retraining from scratch")
+            elif datetime.now() - last_full > timedelta(days=full_retrain_days):
+                logger.info(f"Scheduled full retrain for {self.symbol}")
+            else:
+                mode = 'incremental'
+        
+        if mode == 'incremental' and self.model is not None and self.last_trained_bar is not None:
+            return 'incremental' if self.fine_tune(epochs=fine_tune_epochs) is not None else 'none'
+            
+        self.model = None
+        self.train(epochs=epochs)
+        return 'full'
+    
+    def last_window(self, lookback_days=None):
+        """
+        Get the most recent input window for prediction
+        
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+                (defaults to the lookback the model was trained with)
+            
+        Returns:
+            ndarray: Scaled window of shape (lookback_days, features)
+        """
+        lookback_days = lookback_days or self.lookback_days or 60
+        
         if self.scaled_data is None:
             raise ValueError("No scaled data available. Call prepare_data() first.")
             
@@ -176,35 +709,114 @@ class LSTMPredictor:
         if len(self.scaled_data) < lookback_days:
             raise ValueError(f"Not enough data for prediction. Need at least {lookback_days} days.")
             
-        last_sequence = self.scaled_data[-lookback_days:]
-        last_sequence = np.reshape(last_sequence, (1, lookback_days, 1))
+        return self.scaled_data[-lookback_days:]
+    
+    def export_engine(self, precision=None):
+        """
+        Export the trained Keras model to a TensorFlow-free NumPy engine
+        
+        Once exported, predictions run through the engine instead of Keras.
+        
+        Args:
+            precision (str): Weight precision, 'float32', 'float16' or 'int8'
+                (defaults to MODEL_PRECISION)
+        
+        Returns:
+            NumpyLSTMEngine: Engine computing the same outputs as the saved artifact
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        precision = precision or os.getenv('MODEL_PRECISION', 'float32')
+        self.engine = NumpyLSTMEngine.from_keras(self.model).quantize(precision)
+        return self.engine
+    
+    @property
+    def is_trained(self):
+        """Whether a Keras model or an exported engine is available for inference"""
+        return self.model is not None or self.engine is not None
+    
+    def _predict_scaled(self, windows):
+        """Run scaled windows through the engine if exported, otherwise through Keras"""
+        if self.engine is not None:
+            return self.engine.predict(windows)
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+        return self.model.predict(windows, verbose=0)
+    
+    def predict_windows(self, windows):
+        """
+        Predict the next closing price for a batch of windows in one model call
+        
+        Args:
+            windows (ndarray): Scaled windows of shape (batch, lookback_days, 1)
+            
+        Returns:
+            ndarray: Predicted closing prices, one per window, or a
+                (batch, horizon) array of price paths for multi-horizon models
+        """
+        predicted_scaled = self._predict_scaled(windows)
+        
+        # Inverse transform to get actual prices
+        prices = self.scaler.inverse_transform(predicted_scaled.reshape(-1, 1))
+        if self.horizon == 1:
+            return prices[:, 0]
+        return prices.reshape(-1, self.horizon)
+    
+    def predict_next_day(self, lookback_days=None):
+        """
+        Predict the next day's closing price
         
-        # Predict the next value
-        predicted_scaled = self.model.predict(last_sequence, verbose=0)
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+                (defaults to the lookback the model was trained with)
+            
+        Returns:
+            float: Predicted next day closing price
+        """
+        return self.predict_path(lookback_days)[0]
+    
+    def predict_path(self, lookback_days=None):
+        """
+        Predict closing prices for each day of the horizon in one forward pass
         
-        # Inverse transform to get actual price
-        predicted_price = self.scaler.inverse_transform(predicted_scaled)
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+                (defaults to the lookback the model was trained with)
+            
+        Returns:
+            ndarray: Predicted closing prices for the next `horizon` days
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        last_sequence = self.last_window(lookback_days)[np.newaxis]
         
-        return predicted_price[0][0]
+        return np.atleast_1d(self.predict_windows(last_sequence)[0])
     
-    def evaluate_model(self, lookback_days=60):
+    def evaluate_model(self, lookback_days=None):
         """
         Evaluate the model performance using RMSE
         
         Args:
             lookback_days (int): Number of days to look back for prediction
+                (defaults to the lookback the model was trained with)
             
         Returns:
             dict: Dictionary containing evaluation metrics
         """
-        if self.model is None:
+        lookback_days = lookback_days or self.lookback_days or 60
+        
+        if not self.is_trained:
             raise ValueError("Model not trained. Call train() first.")
             
         X, y = self.prepare_data(lookback_days)
-        predictions = self.model.predict(X, verbose=0)
-        
-        # Inverse transform predictions and actual values
-        predictions_actual = self.scaler.inverse_transform(predictions)
+        return self._score(self._predict_scaled(X), y)
+    
+    def _score(self, predictions, y):
+        """RMSE and MAE of scaled predictions against scaled targets, in price units"""
+        # Inverse transform predictions and actual values, over every horizon step
+        predictions_actual = self.scaler.inverse_transform(predictions.reshape(-1, 1))
         y_actual = self.scaler.inverse_transform(y.reshape(-1, 1))
         
         # Calculate RMSE
@@ -214,60 +826,684 @@ class LSTMPredictor:
         mae = np.mean(np.abs(predictions_actual - y_actual))
         
         return {
-            'rmse': rmse,
-            'mae': mae
+            'rmse': float(rmse),
+            'mae': float(mae)
+        }
+    
+    def backtest(self, **kwargs):
+        """
+        Walk-forward backtest of this predictor's configuration on its fetched data
+        
+        Scores out-of-sample predictions, unlike evaluate_model(), which scores
+        the windows the model was trained on. The predictor's own model is
+        left untouched.
+        
+        Args:
+            **kwargs: Options of models.backtest.walk_forward_backtest()
+            
+        Returns:
+            dict: Per-fold and pooled error and timing
+        """
+        from models.backtest import walk_forward_backtest
+        
+        if self.data is None:
+            self.fetch_data()
+        return walk_forward_backtest(self.symbol, self.period, self.data, horizon=self.horizon,
+                                     config=self.config, **kwargs)
+    
+    def evaluate_quantized(self, precision, lookback_days=None):
+        """
+        Evaluate the model with its weights at reduced precision
+        
+        Args:
+            precision (str): 'float16' or 'int8'
+            lookback_days (int): Number of days to look back for prediction
+                (defaults to the lookback the model was trained with)
+            
+        Returns:
+            dict: Metrics of the quantized model plus their change from full precision
+        """
+        lookback_days = lookback_days or self.lookback_days or 60
+        
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        engine = NumpyLSTMEngine.from_keras(self.model).quantize(precision)
+        X, y = self.prepare_data(lookback_days)
+        metrics = self._score(engine.predict(X), y)
+        metrics['precision'] = precision
+        
+        if self.metrics is not None:
+            metrics['rmse_delta'] = metrics['rmse'] - self.metrics['rmse']
+            metrics['mae_delta'] = metrics['mae'] - self.metrics['mae']
+            logger.info(f"{precision} model metrics - RMSE delta: {metrics['rmse_delta']:+.4f}, "
+                        f"MAE delta: {metrics['mae_delta']:+.4f}")
+        return metrics
+    
+    def get_metrics(self):
+        """
+        Get the evaluation metrics computed when the model was trained
+        
+        Falls back to evaluating once (and caching the result) for models
+        saved before metrics were stored with them. When serving from a
+        reduced-precision engine, the metrics of that precision are returned.
+        
+        Returns:
+            dict: Dictionary containing evaluation metrics
+        """
+        if self.metrics is None:
+            self.metrics = self.evaluate_model()
+            
+        quantized = self.metrics.get('quantized')
+        if self.engine is not None and quantized and quantized.get('precision') == self.engine.precision:
+            return quantized
+        return self.metrics
+    
+    def estimate_memory(self):
+        """
+        Estimate the memory held by this predictor
+        
+        Counts the model weights plus the Adam optimizer's two slot variables
+        per weight, the exported engine's weights, the fetched price history,
+        the scaled copy of it and the feature store's copy of its features.
+        
+        Returns:
+            int: Estimated footprint in bytes
+        """
+        total = 0
+        if self.model is not None:
+            total += self.model.count_params() * 4 * 3
+        if self.engine is not None:
+            total += self.engine.nbytes
+        if self.data is not None:
+            total += int(self.data.memory_usage(deep=True).sum())
+        if self.scaled_data is not None:
+            total += self.scaled_data.nbytes
+        total += feature_store.nbytes(self.feature_key)
+        return total
+    
+    def artifact_path(self):
+        """Path of the single-file artifact holding the model, scaler and metadata"""
+        return artifact_file(self.model_dir, self.model_key)
+    
+    def legacy_artifact_paths(self):
+        """
+        Paths of the model and scaler files written before single-file artifacts
+        
+        Returns:
+            tuple: (model_path, scaler_path)
+        """
+        return legacy_artifact_files(self.model_dir, self.model_key)
+    
+    def artifact_paths(self):
+        """
+        Paths of the files that make up the saved model
+        
+        Returns:
+            tuple: The single-file artifact if there is one, otherwise the
+                legacy (model_path, scaler_path) pair
+        """
+        if os.path.exists(self.artifact_path()):
+            return (self.artifact_path(),)
+        return self.legacy_artifact_paths()
+    
+    def metadata_path(self):
+        """Path of the JSON file holding training metadata of legacy artifacts"""
+        return os.path.join(self.model_dir, f"{self.model_key}_meta.json")
+    
+    def engine_path(self):
+        """Path of the NumPy engine weights exported alongside legacy artifacts"""
+        return os.path.join(self.model_dir, f"{self.model_key}_numpy.npz")
+    
+    def _metadata(self):
+        """Training metadata and metrics stored with the model"""
+        return {
+            'symbol': self.symbol,
+            'period': self.period,
+            'lookback_days': self.lookback_days,
+            'horizon': self.horizon,
+            'config': self.config,
+            'training_precision': self.training_precision,
+            'trained_at': self.trained_at,
+            'last_full_train': self.last_full_train,
+            'last_trained_bar': self.last_trained_bar,
+            'metrics': self.metrics,
+            'observed_min': self.observed_min,
+            'observed_max': self.observed_max
         }
     
+    def _apply_metadata(self, metadata):
+        """Restore training metadata and metrics saved by _metadata()"""
+        # Models saved before multi-feature input only saw the close
+        self.config.update({'features': ['Close'], **(metadata.get('config') or {})})
+        self.lookback_days = metadata.get('lookback_days')
+        self.training_precision = metadata.get('training_precision') or self.training_precision
+        self.trained_at = metadata.get('trained_at')
+        self.last_full_train = metadata.get('last_full_train')
+        self.last_trained_bar = metadata.get('last_trained_bar')
+        self.metrics = metadata.get('metrics')
+        self.observed_min = metadata.get('observed_min', float('inf'))
+        self.observed_max = metadata.get('observed_max', float('-inf'))
+    
+    def load_config(self):
+        """
+        Reuse the hyperparameters saved with this model's last artifact
+        
+        Lets a retrain from scratch keep a configuration found by
+        hyperparameter search.
+        
+        Returns:
+            bool: True if a saved configuration was found
+        """
+        if os.path.exists(self.artifact_path()):
+            config = read_metadata(self.artifact_path()).get('config')
+        elif os.path.exists(self.metadata_path()):
+            with open(self.metadata_path(), 'r') as f:
+                config = json.load(f).get('config')
+        else:
+            return False
+        if not config:
+            return False
+            
+        self.config.update(config)
+        logger.info(f"Using saved configuration for {self.model_key}: {config}")
+        return True
+    
     def save_model(self):
         """
-        Save the trained model and scaler to disk
+        Save the trained model, scaler and metadata as one versioned artifact
+        
+        Weights are stored at MODEL_PRECISION for serving; when that is below
+        float32 the full-precision weights are stored too so the model can
+        keep training. The file is replaced atomically, so concurrent readers
+        never see a torn model/scaler pair.
         """
         if self.model is None:
             raise ValueError("No model to save. Train the model first.")
             
-        # Create filename based on symbol and period
-        model_filename = f"{self.symbol}_{self.period}.h5"
-        scaler_filename = f"{self.symbol}_{self.period}_scaler.npy"
-        
-        # Save model
-        model_path = os.path.join(self.model_dir, model_filename)
-        self.model.save(model_path)
+        precision = os.getenv('MODEL_PRECISION', 'float32')
+        engine = NumpyLSTMEngine.from_keras(self.model)
+        arrays = engine.quantize(precision).to_arrays('engine_')
+        if precision != 'float32':
+            arrays.update({f'weights_{i}': weight for i, weight in enumerate(engine.get_weights())})
+        arrays.update(scaler_arrays(self.scaler, 'scaler_'))
+        if len(self.feature_names) > 1:
+            arrays.update(scaler_arrays(self.feature_scaler, 'feature_scaler_'))
+            
+        metadata = self._metadata()
+        metadata['feature_range'] = list(self.scaler.feature_range)
+        metadata['precision'] = precision
+        metadata = save_artifact(self.artifact_path(), arrays, metadata)
+        self.artifact_version = metadata['version']
+        self.content_hash = metadata['content_hash']
         
-        # Save scaler
-        scaler_path = os.path.join(self.model_dir, scaler_filename)
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(self.scaler, f)
+        # Files of the old layout would otherwise shadow nothing but waste space
+        for path in (*self.legacy_artifact_paths(), self.metadata_path(), self.engine_path()):
+            if os.path.exists(path):
+                os.remove(path)
         
-        logger.info(f"Model saved to {model_path}")
-        logger.info(f"Scaler saved to {scaler_path}")
+        logger.info(f"Model saved to {self.artifact_path()} (version {self.artifact_version})")
     
-    def load_model(self):
+    def load_model(self, backend=None):
         """
         Load a trained model and scaler from disk
+        
+        Args:
+            backend (str): 'keras' rebuilds the full model, which can keep
+                training; 'numpy' loads only the engine weights and never
+                imports TensorFlow. Defaults to INFERENCE_BACKEND.
         """
-        # Create filename based on symbol and period
-        model_filename = f"{self.symbol}_{self.period}.h5"
-        scaler_filename = f"{self.symbol}_{self.period}_scaler.npy"
+        backend = backend or os.getenv('INFERENCE_BACKEND', 'keras')
+        if backend not in ('keras', 'numpy'):
+            raise ValueError(f"Unsupported inference backend: {backend}")
+            
+        if not os.path.exists(self.artifact_path()):
+            return self._load_legacy(backend)
+            
+        metadata, arrays = load_artifact(self.artifact_path())
+        self._apply_metadata(metadata)
         
-        # Check if model file exists
-        model_path = os.path.join(self.model_dir, model_filename)
-        scaler_path = os.path.join(self.model_dir, scaler_filename)
+        feature_range = tuple(metadata['feature_range'])
+        self.scaler = restore_scaler(arrays, 'scaler_', feature_range)
+        if len(self.feature_names) > 1:
+            self.feature_scaler = restore_scaler(arrays, 'feature_scaler_', feature_range)
+            
+        engine = NumpyLSTMEngine.from_arrays(arrays, 'engine_')
+        if backend == 'numpy':
+            self.model = None
+            self.engine = engine
+        else:
+            weights = [arrays[f'weights_{i}'] for i in range(len(engine.get_weights()))] \
+                if 'weights_0' in arrays else engine.get_weights()
+            self.build_model(self.lookback_days)
+            self.model.set_weights(weights)
+            self.engine = None
+            
+        self.artifact_version = metadata['version']
+        self.content_hash = metadata['content_hash']
+        logger.info(f"Model loaded from {self.artifact_path()} (version {self.artifact_version})")
+        return True
+    
+    def _load_legacy(self, backend):
+        """Load a model saved as separate .h5, scaler and metadata files"""
+        model_path, scaler_path = self.legacy_artifact_paths()
         
+        # Check if model file exists
         if not os.path.exists(model_path) or not os.path.exists(scaler_path):
             logger.warning(f"Model files not found for {self.symbol}")
             return False
             
-        # Load model
-        self.model = load_model(model_path)
+        if backend == 'numpy' and os.path.exists(self.engine_path()):
+            self.model = None
+            self.engine = NumpyLSTMEngine.load(self.engine_path())
+        else:
+            from tensorflow.keras.models import load_model  # pylint: disable=import-error
+            
+            self.model = load_model(model_path, compile=False)
+            self.engine = None
+            if backend == 'numpy':
+                # Models saved before engine export get exported on load
+                self.export_engine()
         
         # Load scaler
         with open(scaler_path, 'rb') as f:
             self.scaler = pickle.load(f)
         
+        # Load training metadata and metrics, if they were saved
+        if os.path.exists(self.metadata_path()):
+            with open(self.metadata_path(), 'r') as f:
+                self._apply_metadata(json.load(f))
+        
+        # A fresh optimizer with the saved learning rate lets the model keep training
+        if self.model is not None:
+            self.compile_model()
+        
         logger.info(f"Model loaded from {model_path}")
         logger.info(f"Scaler loaded from {scaler_path}")
         return True
 
+class GlobalLSTMPredictor:
+    def __init__(self, symbols, period='2y', model_dir=None):
+        """
+        Initialize a global Oasis LSTM Predictor shared by many symbols
+        
+        One network is trained on windows from every symbol. Each symbol keeps
+        its own scaler (per-symbol normalization) and is identified to the
+        network through a learned embedding, so a single resident model can
+        serve predictions for all of them.
+        
+        Args:
+            symbols (list): Stock or crypto symbols covered by the model
+            period (str): Period for historical data ('1y', '2y', etc.)
+            model_dir (str): Directory to save/load models
+        """
+        self.symbols = list(dict.fromkeys(symbols))
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.period = period
+        self.model_dir = model_dir or os.getenv('MODEL_DIR', 'models')
+        self.model = None
+        self.lookback_days = None
+        self.trained_at = None
+        
+        configure_process()
+        
+        # Per-symbol data and scalers live in plain predictors without a model
+        self.predictors = {
+            symbol: LSTMPredictor(symbol, period=period, model_dir=self.model_dir, config={'features': ['Close']})
+            for symbol in self.symbols
+        }
+    
+    @property
+    def model_key(self):
+        """Key identifying the global model on disk"""
+        return f"global_{self.period}"
+    
+    def __contains__(self, symbol):
+        """Whether the model was trained on the symbol and can serve it"""
+        return symbol in self.predictors and self.predictors[symbol].metrics is not None
+    
+    def fetch_data(self, data_handler=None):
+        """
+        Fetch historical data for every symbol
+        
+        Args:
+            data_handler (DataHandler): Local store to read the bars through, see LSTMPredictor.fetch_data()
+        
+        Returns:
+            list: Symbols whose data could not be fetched
+        """
+        failed = []
+        for symbol, predictor in self.predictors.items():
+            if not predictor.fetch_data(data_handler) or predictor.data is None or predictor.data.empty:
+                failed.append(symbol)
+        return failed
+    
+    def _ready_symbols(self, lookback_days):
+        """Symbols with enough data to build at least one window"""
+        return [
+            symbol for symbol, predictor in self.predictors.items()
+            if predictor.data is not None and len(predictor.data) > lookback_days
+        ]
+    
+    def build_model(self, lookback_days=60, embedding_dim=8):
+        """
+        Build the global LSTM model
+        
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+            embedding_dim (int): Size of the learned symbol embedding
+        """
+        # pylint: disable=import-error
+        from tensorflow.keras.models import Model
+        from tensorflow.keras.layers import LSTM, Concatenate, Dense, Dropout, Embedding, Flatten, Input
+        from tensorflow.keras.optimizers import Adam
+        # pylint: enable=import-error
+        
+        window = Input(shape=(lookback_days, 1), name='window')
+        symbol_id = Input(shape=(1,), dtype='int32', name='symbol_id')
+        
+        # Same three LSTM layers as the per-symbol model
+        x = LSTM(units=50, return_sequences=True)(window)
+        x = Dropout(0.2)(x)
+        x = LSTM(units=50, return_sequences=True)(x)
+        x = Dropout(0.2)(x)
+        x = LSTM(units=50, return_sequences=False)(x)
+        x = Dropout(0.2)(x)
+        
+        # Condition the output on the symbol
+        embedding = Flatten()(Embedding(len(self.symbols), embedding_dim)(symbol_id))
+        output = Dense(units=1)(Concatenate()([x, embedding]))
+        
+        self.model = Model(inputs=[window, symbol_id], outputs=output)
+        self.model.compile(optimizer=Adam(learning_rate=0.001), loss='mean_squared_error')
+        
+        return self.model
+    
+    def prepare_data(self, lookback_days=60, refit=False, symbols=None):
+        """
+        Prepare windows from all symbols as one training set
+        
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+            refit (bool): Refit every symbol's scaler
+            symbols (list): Symbols to include, defaults to all with enough data
+            
+        Returns:
+            tuple: (X, ids, y) with ids holding the symbol id of each window
+        """
+        symbols = symbols or self._ready_symbols(lookback_days)
+        if not symbols:
+            raise ValueError("No symbol has enough data. Call fetch_data() first.")
+            
+        X, ids, y = [], [], []
+        for symbol in symbols:
+            symbol_X, symbol_y = self.predictors[symbol].prepare_data(lookback_days, refit=refit)
+            X.append(symbol_X)
+            y.append(symbol_y)
+            ids.append(np.full(len(symbol_y), self.symbol_ids[symbol], dtype=np.int32))
+            
+        return np.concatenate(X), np.concatenate(ids), np.concatenate(y)
+    
+    def train(self, epochs=None, batch_size=None, lookback_days=None):
+        """
+        Train the global model on windows from every symbol in one job
+        
+        Args:
+            epochs (int): Number of training epochs
+            batch_size (int): Batch size for training
+            lookback_days (int): Number of days to look back for prediction
+        """
+        epochs = epochs or int(os.getenv('DEFAULT_EPOCHS', 50))
+        batch_size = batch_size or int(os.getenv('GLOBAL_BATCH_SIZE', 256))
+        lookback_days = lookback_days or int(os.getenv('DEFAULT_LOOKBACK_DAYS', 60))
+        
+        from models.training_callbacks import epoch_budget, training_callbacks
+        epochs = epoch_budget(epochs)
+        
+        from_scratch = self.model is None
+        X, ids, y = self.prepare_data(lookback_days, refit=from_scratch)
+        
+        logger.info(f"Training global model on {len(y)} windows from {len(set(ids.tolist()))} symbols "
+                    f"with up to {epochs} epochs, batch size {batch_size}, lookback {lookback_days}")
+        
+        if from_scratch:
+            self.build_model(lookback_days)
+            
+        if os.getenv('TRAINING_INPUT_PIPELINE', 'numpy') == 'dataset':
+            train_data, validation_data = self.make_datasets(lookback_days, batch_size)
+            inputs = {'x': train_data}
+        else:
+            # Hold out the most recent windows of every symbol for validation
+            holdout = self._validation_mask(ids)
+            validation_data = None
+            if holdout.any() and not holdout.all():
+                validation_data = ([X[holdout], ids[holdout]], y[holdout])
+                X, ids, y = X[~holdout], ids[~holdout], y[~holdout]
+            inputs = {'x': [X, ids], 'y': y, 'batch_size': batch_size, 'shuffle': True}
+            
+        history = self.model.fit(
+            **inputs,
+            validation_data=validation_data,
+            epochs=epochs,
+            callbacks=training_callbacks(validation=validation_data is not None),
+            verbose=0
+        )
+        logger.info(f"Global model training completed after {len(history.epoch)} epochs")
+        
+        self.lookback_days = lookback_days
+        self.trained_at = datetime.now().isoformat()
+        metrics = self.evaluate_model()
+        for symbol, predictor in self.predictors.items():
+            predictor.lookback_days = lookback_days
+            predictor.trained_at = self.trained_at
+            predictor.metrics = metrics.get(symbol)
+            if predictor.data is not None and not predictor.data.empty:
+                predictor.last_trained_bar = predictor.data.index[-1].isoformat()
+        
+        return history
+    
+    def make_datasets(self, lookback_days, batch_size, validation_split=None):
+        """
+        Build tf.data pipelines over every symbol's series, windows cut on the fly
+        
+        Args:
+            lookback_days (int): Number of days to look back for prediction
+            batch_size (int): Batch size for training
+            validation_split (float): Fraction of each symbol's most recent windows held out
+            
+        Returns:
+            tuple: (train_dataset, validation_dataset), the latter None without a holdout
+        """
+        from models.datasets import training_dataset, window_dataset
+        
+        train_parts, validation_parts = [], []
+        for symbol in self._ready_symbols(lookback_days):
+            values = self.predictors[symbol].scaled_data[:, 0]
+            samples = len(values) - lookback_days
+            holdout = validation_size(samples, validation_split)
+            symbol_id = self.symbol_ids[symbol]
+            
+            train_parts.append(window_dataset(values, lookback_days, end=samples - holdout, symbol_id=symbol_id))
+            if holdout:
+                validation_parts.append(
+                    window_dataset(values, lookback_days, start=samples - holdout, symbol_id=symbol_id)
+                )
+        
+        train_data = training_dataset(train_parts, batch_size, name=f"{self.model_key}_train")
+        validation_data = None
+        if validation_parts:
+            validation_data = training_dataset(
+                validation_parts, batch_size, shuffle=False, name=f"{self.model_key}_validation"
+            )
+        return train_data, validation_data
+    
+    @staticmethod
+    def _validation_mask(ids, validation_split=None):
+        """
+        Mark the last windows of each symbol as the validation holdout
+        
+        Args:
+            ids (ndarray): Symbol id of each window, windows of a symbol in time order
+            validation_split (float): Fraction held out per symbol (defaults to VALIDATION_SPLIT)
+            
+        Returns:
+            ndarray: Boolean mask of held out windows
+        """
+        mask = np.zeros(len(ids), dtype=bool)
+        for symbol_id in np.unique(ids):
+            positions = np.flatnonzero(ids == symbol_id)
+            holdout = validation_size(len(positions), validation_split)
+            if holdout:
+                mask[positions[-holdout:]] = True
+        return mask
+    
+    def predict_symbols(self, symbols):
+        """
+        Predict the next day's closing price for many symbols in one model call
+        
+        Args:
+            symbols (list): Symbols covered by the model
+            
+        Returns:
+            ndarray: Predicted next day closing prices, in the order given
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        windows = np.stack([self.predictors[symbol].last_window(self.lookback_days) for symbol in symbols])
+        ids = np.array([self.symbol_ids[symbol] for symbol in symbols], dtype=np.int32)
+        predicted_scaled = self.model.predict([windows, ids], verbose=0)
+        
+        # Undo each symbol's own normalization
+        return np.array([
+            self.predictors[symbol].scaler.inverse_transform(predicted_scaled[i:i + 1])[0, 0]
+            for i, symbol in enumerate(symbols)
+        ])
+    
+    def predict_next_day(self, symbol):
+        """
+        Predict the next day's closing price for one symbol
+        
+        Args:
+            symbol (str): Symbol covered by the model
+            
+        Returns:
+            float: Predicted next day closing price
+        """
+        return self.predict_symbols([symbol])[0]
+    
+    def evaluate_model(self):
+        """
+        Evaluate the global model per symbol with one batched inference
+        
+        Returns:
+            dict: Symbol -> dictionary containing evaluation metrics
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+            
+        symbols = self._ready_symbols(self.lookback_days)
+        X, ids, y = self.prepare_data(self.lookback_days, symbols=symbols)
+        predictions = self.model.predict([X, ids], verbose=0)[:, 0]
+        
+        metrics = {}
+        for symbol in symbols:
+            mask = ids == self.symbol_ids[symbol]
+            scaler = self.predictors[symbol].scaler
+            predictions_actual = scaler.inverse_transform(predictions[mask].reshape(-1, 1))
+            y_actual = scaler.inverse_transform(y[mask].reshape(-1, 1))
+            metrics[symbol] = {
+                'rmse': float(np.sqrt(np.mean((predictions_actual - y_actual) ** 2))),
+                'mae': float(np.mean(np.abs(predictions_actual - y_actual)))
+            }
+        return metrics
+    
+    def artifact_paths(self):
+        """
+        Paths of the model and scalers files for the global model
+        
+        Returns:
+            tuple: (model_path, scalers_path)
+        """
+        model_path = os.path.join(self.model_dir, f"{self.model_key}.h5")
+        scalers_path = os.path.join(self.model_dir, f"{self.model_key}_scalers.pkl")
+        return model_path, scalers_path
+    
+    def metadata_path(self):
+        """Path of the JSON file holding training metadata and metrics"""
+        return os.path.join(self.model_dir, f"{self.model_key}_meta.json")
+    
+    def save_model(self):
+        """
+        Save the global model, per-symbol scalers and metadata to disk
+        """
+        if self.model is None:
+            raise ValueError("No model to save. Train the model first.")
+            
+        model_path, scalers_path = self.artifact_paths()
+        self.model.save(model_path)
+        
+        with open(scalers_path, 'wb') as f:
+            pickle.dump({symbol: predictor.scaler for symbol, predictor in self.predictors.items()}, f)
+            
+        with open(self.metadata_path(), 'w') as f:
+            json.dump({
+                'symbols': self.symbols,
+                'lookback_days': self.lookback_days,
+                'trained_at': self.trained_at,
+                'metrics': {symbol: predictor.metrics for symbol, predictor in self.predictors.items()}
+            }, f)
+        
+        logger.info(f"Global model saved to {model_path}")
+    
+    @classmethod
+    def load(cls, period='2y', model_dir=None):
+        """
+        Load a saved global model
+        
+        Args:
+            period (str): Period the model was trained on
+            model_dir (str): Directory holding saved models
+            
+        Returns:
+            GlobalLSTMPredictor: Loaded predictor (without data), or None if not saved
+        """
+        model_dir = model_dir or os.getenv('MODEL_DIR', 'models')
+        metadata_path = os.path.join(model_dir, f"global_{period}_meta.json")
+        if not os.path.exists(metadata_path):
+            logger.warning(f"Global model not found for period {period}")
+            return None
+            
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+            
+        predictor = cls(metadata['symbols'], period=period, model_dir=model_dir)
+        model_path, scalers_path = predictor.artifact_paths()
+        if not os.path.exists(model_path) or not os.path.exists(scalers_path):
+            logger.warning(f"Global model files not found for period {period}")
+            return None
+            
+        # pylint: disable=import-error
+        from tensorflow.keras.models import load_model
+        from tensorflow.keras.optimizers import Adam
+        # pylint: enable=import-error
+        
+        predictor.model = load_model(model_path, compile=False)
+        predictor.model.compile(optimizer=Adam(learning_rate=0.001), loss='mean_squared_error')
+        with open(scalers_path, 'rb') as f:
+            scalers = pickle.load(f)
+            
+        predictor.lookback_days = metadata['lookback_days']
+        predictor.trained_at = metadata['trained_at']
+        for symbol, member in predictor.predictors.items():
+            member.scaler = scalers[symbol]
+            member.lookback_days = predictor.lookback_days
+            member.trained_at = predictor.trained_at
+            member.metrics = metadata['metrics'].get(symbol)
+        
+        logger.info(f"Global model loaded from {model_path}")
+        return predictor
+
 # Example usage
 if __name__ == "__main__":
     # Set up logging for the example
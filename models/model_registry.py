@@ -0,0 +1,421 @@
+"""
+Model registry for Oasis
+Shares trained models between API workers and the scheduler through MODEL_DIR
+"""
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from data.data_handler import DataHandler
+from data.feature_store import feature_store
+from models.artifact_store import read_metadata
+from models.lstm_predictor import GlobalLSTMPredictor, LSTMPredictor, artifact_file, legacy_artifact_files
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    def __init__(self, model_dir=None, max_memory_mb=None, data_handler=None):
+        """
+        Initialize the model registry
+
+        Every process on a node that points at the same MODEL_DIR sees the same
+        models: a model saved by one worker is lazily loaded by the others on
+        first use and picked up again whenever a newer artifact is written.
+
+        Models held in memory are bounded by an estimated memory budget; the
+        least recently used ones are evicted and reloaded from disk on demand.
+
+        Args:
+            model_dir (str): Directory holding saved models
+            max_memory_mb (float): Memory budget for in-memory models in MB
+            data_handler (DataHandler): Local market data store loaded models
+                read their serving bars from
+        """
+        self.model_dir = model_dir or os.getenv('MODEL_DIR', 'models')
+        if not os.path.exists(self.model_dir):
+            os.makedirs(self.model_dir)
+
+        self.max_memory_bytes = (max_memory_mb or float(os.getenv('MODEL_CACHE_MAX_MB', 1024))) * 1024 * 1024
+        self.models = OrderedDict()  # model_key -> LSTMPredictor, least recently used first
+        self.versions = {}  # model_key -> artifact version the predictor was loaded from
+        self.footprints = {}  # model_key -> estimated bytes held by the predictor
+        self.global_models = {}  # period -> resident GlobalLSTMPredictor
+        self.global_versions = {}  # period -> artifact version of the resident global model
+        self.stored_versions = {}  # artifact path -> (file identity, version read from its metadata)
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self.data_handler = data_handler or DataHandler()
+
+    @staticmethod
+    def make_key(symbol, period, horizon=1):
+        """Build the registry key for a symbol, period and forecast horizon"""
+        if horizon == 1:
+            return f"{symbol}_{period}"
+        return f"{symbol}_{period}_h{horizon}"
+
+    @staticmethod
+    def parse_key(model_key):
+        """
+        Split a registry key into its parts
+
+        Returns:
+            tuple: (symbol, period, horizon)
+        """
+        horizon = 1
+        match = re.search(r'_h(\d+)$', model_key)
+        if match:
+            horizon = int(match.group(1))
+            model_key = model_key[:match.start()]
+        symbol, _, period = model_key.rpartition('_')
+        return symbol, period, horizon
+
+    def _key_lock(self, model_key):
+        """Per-key lock so one thread loads a model while others wait for it"""
+        with self.lock:
+            if model_key not in self.key_locks:
+                self.key_locks[model_key] = threading.Lock()
+            return self.key_locks[model_key]
+
+    @contextmanager
+    def _artifact_lock(self, model_key, exclusive=False, suffix='lock'):
+        """
+        Cross-process file lock guarding a model's files
+
+        Writers take it exclusively so readers in other workers never load a
+        half-written model/scaler pair.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        lock_path = os.path.join(self.model_dir, f"{model_key}.{suffix}")
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def training_lock(self, symbol, period, horizon=1):
+        """
+        Cross-process lock held while a model is trained
+
+        Separate from the artifact lock so serving workers keep loading the
+        current model while another process trains its successor; only one
+        process on the node trains a given key at a time.
+        """
+        return self._artifact_lock(self.make_key(symbol, period, horizon), exclusive=True, suffix='train')
+
+    def _new_predictor(self, symbol, period, horizon=1):
+        return LSTMPredictor(symbol, period=period, model_dir=self.model_dir, horizon=horizon)
+
+    def artifact_version(self, symbol, period, horizon=1):
+        """
+        Version of the saved artifact for a model
+
+        Single-file artifacts carry the version they were saved with in their
+        metadata. It is read again only when the file itself changes, so a
+        check costs one stat; legacy model files fall back to their
+        modification time. Runs on every prediction, so it works from the
+        file names alone without building a predictor.
+
+        Returns:
+            float: Save time of the artifact in seconds, or None if not saved
+        """
+        model_key = self.make_key(symbol, period, horizon)
+        try:
+            return self._stored_version(artifact_file(self.model_dir, model_key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return None
+        try:
+            return max(os.path.getmtime(path) for path in legacy_artifact_files(self.model_dir, model_key))
+        except OSError:
+            return None
+
+    def _stored_version(self, path):
+        """Version recorded in a single-file artifact's metadata, in seconds"""
+        stat = os.stat(path)
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self.stored_versions.get(path)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+
+        try:
+            version = read_metadata(path)['version'] / 1e9
+        except Exception as e:
+            logger.warning(f"Could not read the version of {path}, using its modification time: {e}")
+            version = stat.st_mtime
+        self.stored_versions[path] = (identity, version)
+        return version
+
+    def get(self, symbol, period, horizon=1):
+        """
+        Get a trained predictor, loading it from MODEL_DIR if needed
+
+        Args:
+            symbol (str): Stock or crypto symbol
+            period (str): Period the model was trained on
+            horizon (int): Number of days the model predicts
+
+        Returns:
+            LSTMPredictor: Trained predictor, or None if no model exists yet
+        """
+        model_key = self.make_key(symbol, period, horizon)
+        disk_version = self.artifact_version(symbol, period, horizon)
+
+        predictor = self.models.get(model_key)
+        if predictor is not None and (disk_version is None or disk_version <= self.versions.get(model_key, 0)):
+            with self.lock:
+                if model_key in self.models:
+                    self.models.move_to_end(model_key)
+            return predictor
+
+        if disk_version is None:
+            return None
+
+        with self._key_lock(model_key):
+            # Another thread may have finished the load while we waited
+            if model_key in self.models and disk_version <= self.versions.get(model_key, 0):
+                return self.models[model_key]
+            return self._load(symbol, period, horizon)
+
+    def load_saved(self, symbol, period, backend='keras', horizon=1):
+        """
+        Load a private copy of a saved model, without data
+
+        Useful for retraining without touching the instance that is serving.
+
+        Args:
+            symbol (str): Stock or crypto symbol
+            period (str): Period the model was trained on
+            backend (str): Backend passed to LSTMPredictor.load_model; retraining
+                needs 'keras', None uses INFERENCE_BACKEND
+            horizon (int): Number of days the model predicts
+
+        Returns:
+            tuple: (LSTMPredictor, version), or (None, None) if nothing is saved
+        """
+        model_key = self.make_key(symbol, period, horizon)
+        predictor = self._new_predictor(symbol, period, horizon)
+
+        logger.info(f"Loading model {model_key} from {self.model_dir}")
+        with self._artifact_lock(model_key):
+            version = self.artifact_version(symbol, period, horizon)
+            if not predictor.load_model(backend=backend):
+                return None, None
+        return predictor, version
+
+    def _load(self, symbol, period, horizon=1):
+        """
+        Load a saved model and the data it needs for inference
+
+        The bars come from the local data store, which only goes upstream
+        for ranges it has not fetched yet, so a cold load usually makes no
+        network request.
+        """
+        model_key = self.make_key(symbol, period, horizon)
+        predictor, version = self.load_saved(symbol, period, backend=None, horizon=horizon)
+        if predictor is None:
+            return None
+
+        if not predictor.fetch_data(self.data_handler) or predictor.data.empty:
+            logger.error(f"Failed to fetch data for loaded model {model_key}")
+            return None
+        predictor.scale_data()
+
+        self._register(predictor, version)
+        return predictor
+
+    def put(self, predictor):
+        """
+        Save a trained predictor to MODEL_DIR and register it in this process
+
+        Args:
+            predictor (LSTMPredictor): Trained predictor
+        """
+        model_key = predictor.model_key
+        predictor.model_dir = self.model_dir
+
+        with self._artifact_lock(model_key, exclusive=True):
+            predictor.save_model()
+            version = self.artifact_version(predictor.symbol, predictor.period, predictor.horizon)
+
+        self._register(predictor, version)
+        logger.info(f"Registered model {model_key}")
+
+    def _register(self, predictor, version):
+        """Hold a predictor in memory and evict others to stay within budget"""
+        model_key = predictor.model_key
+        with self.lock:
+            self.models[model_key] = predictor
+            self.models.move_to_end(model_key)
+            self.versions[model_key] = version or 0
+            self.footprints[model_key] = predictor.estimate_memory()
+            self._evict()
+
+    def memory_usage(self):
+        """Estimated bytes held by in-memory models"""
+        return sum(self.footprints.values())
+
+    def _evict(self):
+        """Drop least recently used models until within the memory budget"""
+        while len(self.models) > 1 and self.memory_usage() > self.max_memory_bytes:
+            model_key, predictor = self.models.popitem(last=False)
+            self.footprints.pop(model_key, None)
+            self.versions.pop(model_key, None)
+
+            # Spill models that never reached disk so they can be reloaded
+            if self.artifact_version(predictor.symbol, predictor.period, predictor.horizon) is None:
+                with self._artifact_lock(model_key, exclusive=True):
+                    predictor.save_model()
+
+            # Other horizons and the global model may still read the same features
+            if not self._features_in_use(predictor.symbol, predictor.period):
+                feature_store.clear(predictor.feature_key)
+            logger.info(f"Evicted model {model_key} from memory")
+
+    def _features_in_use(self, symbol, period):
+        """Whether a resident model still reads the cached features of a symbol and period"""
+        if any(other.symbol == symbol and other.period == period for other in self.models.values()):
+            return True
+        global_model = self.global_models.get(period)
+        return global_model is not None and symbol in global_model.predictors
+
+    def global_artifact_version(self, period):
+        """
+        Version of the saved global model for a period
+
+        Returns:
+            float: Modification time of the newest global model file, or None if not saved
+        """
+        predictor = GlobalLSTMPredictor([], period=period, model_dir=self.model_dir)
+        try:
+            return max(os.path.getmtime(path) for path in (*predictor.artifact_paths(), predictor.metadata_path()))
+        except OSError:
+            return None
+
+    def get_global(self, period):
+        """
+        Get the resident global model for a period, loading it when a newer one is saved
+
+        Args:
+            period (str): Period the global model was trained on
+
+        Returns:
+            GlobalLSTMPredictor: Global model with data ready for inference, or None
+        """
+        disk_version = self.global_artifact_version(period)
+        if disk_version is None:
+            return self.global_models.get(period)
+
+        current = self.global_models.get(period)
+        if current is not None and disk_version <= self.global_versions.get(period, 0):
+            return current
+
+        model_key = f"global_{period}"
+        with self._key_lock(model_key):
+            if period in self.global_models and disk_version <= self.global_versions.get(period, 0):
+                return self.global_models[period]
+
+            logger.info(f"Loading global model for {period} from {self.model_dir}")
+            with self._artifact_lock(model_key):
+                version = self.global_artifact_version(period)
+                predictor = GlobalLSTMPredictor.load(period, model_dir=self.model_dir)
+            if predictor is None:
+                return current
+
+            predictor.fetch_data(self.data_handler)
+            for symbol, member in predictor.predictors.items():
+                if symbol in predictor and member.data is not None and not member.data.empty:
+                    member.scale_data()
+
+            with self.lock:
+                self.global_models[period] = predictor
+                self.global_versions[period] = version or 0
+            return predictor
+
+    def put_global(self, predictor):
+        """
+        Save a trained global model to MODEL_DIR and make it resident in this process
+
+        Args:
+            predictor (GlobalLSTMPredictor): Trained global model
+        """
+        predictor.model_dir = self.model_dir
+        with self._artifact_lock(predictor.model_key, exclusive=True):
+            predictor.save_model()
+            version = self.global_artifact_version(predictor.period)
+
+        with self.lock:
+            self.global_models[predictor.period] = predictor
+            self.global_versions[predictor.period] = version or 0
+        logger.info(f"Registered global model {predictor.model_key}")
+
+    def saved_models(self):
+        """
+        List the models saved in MODEL_DIR
+
+        Returns:
+            list: (symbol, period, horizon) tuples with a complete artifact on disk
+        """
+        saved = []
+        for filename in sorted(os.listdir(self.model_dir)):
+            if filename.startswith('global_'):
+                continue
+            for suffix in ('.model.npz', '.h5'):
+                if filename.endswith(suffix):
+                    break
+            else:
+                continue
+            model = self.parse_key(filename[:-len(suffix)])
+            if model[0] and model not in saved and self.artifact_version(*model) is not None:
+                saved.append(model)
+        return saved
+
+    def preload(self, model_keys=None):
+        """
+        Load saved models into memory ahead of the first request
+
+        Args:
+            model_keys (list): Keys to load; None loads every saved model
+
+        Returns:
+            tuple: (loaded, failed) lists of model keys
+        """
+        saved = {self.make_key(*model): model for model in self.saved_models()}
+        loaded, failed = [], []
+
+        for model_key in (saved if model_keys is None else model_keys):
+            if model_key not in saved:
+                logger.warning(f"No saved model {model_key} to preload")
+                failed.append(model_key)
+                continue
+            try:
+                if self.get(*saved[model_key]) is None:
+                    failed.append(model_key)
+                else:
+                    loaded.append(model_key)
+            except Exception as e:
+                logger.error(f"Failed to preload model {model_key}: {e}")
+                failed.append(model_key)
+
+        logger.info(f"Preloaded {len(loaded)} models, {len(failed)} failed")
+        return loaded, failed
+
+    def __contains__(self, model_key):
+        return model_key in self.models
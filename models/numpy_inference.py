@@ -0,0 +1,311 @@
+"""
+NumPy inference engine for Oasis LSTM models
+Runs the forward pass of a trained LSTM stack without TensorFlow
+"""
+import os
+import threading
+import numpy as np
+
+PRECISIONS = ('float32', 'float16', 'int8')
+
+
+def _quantize(weight, precision):
+    """
+    Encode a float32 weight at reduced precision
+
+    int8 uses symmetric per-output-column scales, so each gate unit keeps
+    its own range.
+
+    Returns:
+        tuple: (stored array, scales or None)
+    """
+    if precision == 'float32':
+        return weight, None
+    if precision == 'float16':
+        return weight.astype(np.float16), None
+
+    scales = np.abs(weight).max(axis=0) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(weight / scales), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _dequantize(stored, scales):
+    """Decode a weight stored by _quantize back to float32"""
+    weight = stored.astype(np.float32)
+    if scales is not None:
+        weight *= scales
+    return weight
+
+
+def _sigmoid(x, out):
+    """In-place logistic sigmoid"""
+    np.negative(x, out=out)
+    np.exp(out, out=out)
+    out += 1.0
+    np.reciprocal(out, out=out)
+    return out
+
+
+class NumpyLSTMEngine:
+    def __init__(self, lstm_weights, dense_weights, precision='float32'):
+        """
+        Initialize the engine from raw weights
+
+        Args:
+            lstm_weights (list): (kernel, recurrent_kernel, bias) per LSTM layer, in Keras layout
+                with gates ordered input, forget, cell, output
+            dense_weights (tuple): (kernel, bias) of the output layer
+            precision (str): Precision the weights are stored at on save(); one of PRECISIONS
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision: {precision}")
+        self.precision = precision
+        self.lstm_weights = [
+            tuple(np.ascontiguousarray(w, dtype=np.float32) for w in layer) for layer in lstm_weights
+        ]
+        self.dense_weights = tuple(np.ascontiguousarray(w, dtype=np.float32) for w in dense_weights)
+        self.units = [kernel.shape[1] // 4 for kernel, _, _ in self.lstm_weights]
+        self.input_dim = self.lstm_weights[0][0].shape[0]
+        self.output_dim = self.dense_weights[0].shape[1]
+        self._buffers = {}  # (batch, time steps) -> preallocated state buffers
+        # Predictors are shared across request threads, so the cached buffers are used under a lock
+        self._buffers_lock = threading.Lock()
+        # Larger batches (evaluation, backtests) get buffers of their own that are freed after the call
+        self.max_cached_batch = int(os.getenv('NUMPY_ENGINE_BUFFER_MAX_BATCH', 32))
+
+    @classmethod
+    def from_keras(cls, model):
+        """
+        Extract the weights of a trained Keras Sequential LSTM model
+
+        Supports stacks of LSTM layers (Dropout is skipped, it is a no-op at
+        inference) followed by one Dense output layer.
+
+        Args:
+            model: Trained Keras model as built by LSTMPredictor.build_model
+
+        Returns:
+            NumpyLSTMEngine: Engine computing the same outputs as the model
+        """
+        lstm_weights, dense_weights = [], None
+        for layer in model.layers:
+            kind = layer.__class__.__name__
+            if kind == 'LSTM':
+                config = layer.get_config()
+                if config.get('activation') != 'tanh' or config.get('recurrent_activation') != 'sigmoid':
+                    raise ValueError(f"Unsupported LSTM activations in layer {layer.name}")
+                lstm_weights.append(layer.get_weights())
+            elif kind == 'Dense':
+                if dense_weights is not None:
+                    raise ValueError("Only a single Dense output layer is supported")
+                dense_weights = layer.get_weights()
+            elif kind not in ('Dropout', 'InputLayer'):
+                raise ValueError(f"Unsupported layer type {kind}")
+
+        if not lstm_weights or dense_weights is None:
+            raise ValueError("Model must have LSTM layers followed by a Dense layer")
+        return cls(lstm_weights, dense_weights)
+
+    @classmethod
+    def from_weights(cls, weights, precision='float32'):
+        """
+        Build an engine from a flat weight list in Keras get_weights() order
+
+        Args:
+            weights (list): Three arrays per LSTM layer, then the Dense kernel and bias
+            precision (str): Precision the weights are stored at on save()
+
+        Returns:
+            NumpyLSTMEngine: Engine using the weights
+        """
+        if len(weights) < 5 or (len(weights) - 2) % 3:
+            raise ValueError(f"Unexpected number of weights: {len(weights)}")
+        lstm_weights = [weights[i:i + 3] for i in range(0, len(weights) - 2, 3)]
+        return cls(lstm_weights, weights[-2:], precision=precision)
+
+    def quantize(self, precision):
+        """
+        Get a copy of the engine with weights rounded to a lower precision
+
+        Kernels are rounded; biases stay float32. Computation still runs in
+        float32, so the copy predicts exactly what the saved artifact will.
+
+        Args:
+            precision (str): 'float32', 'float16' or 'int8'
+
+        Returns:
+            NumpyLSTMEngine: Engine that saves at the given precision
+        """
+        def roundtrip(weight):
+            return _dequantize(*_quantize(weight, precision))
+
+        lstm_weights = [
+            (roundtrip(kernel), roundtrip(recurrent_kernel), bias)
+            for kernel, recurrent_kernel, bias in self.lstm_weights
+        ]
+        kernel, bias = self.dense_weights
+        return NumpyLSTMEngine(lstm_weights, (roundtrip(kernel), bias), precision=precision)
+
+    def get_weights(self):
+        """All weights as a flat list, in the order Keras' get_weights() uses"""
+        weights = [w for layer in self.lstm_weights for w in layer]
+        weights.extend(self.dense_weights)
+        return weights
+
+    @property
+    def nbytes(self):
+        """Memory held by the weights and the cached state buffers"""
+        buffers = sum(array.nbytes for layers in self._buffers.values() for buf in layers for array in buf.values())
+        return sum(w.nbytes for w in self.get_weights()) + buffers
+
+    def to_arrays(self, prefix=''):
+        """
+        Encode the weights at the engine's precision as named arrays
+
+        Args:
+            prefix (str): Prefix for every array name, to embed in larger artifacts
+
+        Returns:
+            dict: Name -> ndarray
+        """
+        arrays = {f'{prefix}precision': np.array(self.precision)}
+
+        def put(name, weight):
+            arrays[prefix + name], scales = _quantize(weight, self.precision)
+            if scales is not None:
+                arrays[f'{prefix}{name}_scales'] = scales
+
+        for i, (kernel, recurrent_kernel, bias) in enumerate(self.lstm_weights):
+            put(f'lstm_{i}_kernel', kernel)
+            put(f'lstm_{i}_recurrent_kernel', recurrent_kernel)
+            arrays[f'{prefix}lstm_{i}_bias'] = bias
+        put('dense_kernel', self.dense_weights[0])
+        arrays[f'{prefix}dense_bias'] = self.dense_weights[1]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        """
+        Decode an engine from arrays written by to_arrays()
+
+        Args:
+            arrays: Mapping of name -> ndarray, e.g. a dict or an open NpzFile
+            prefix (str): Prefix the arrays were written with
+
+        Returns:
+            NumpyLSTMEngine: Decoded engine
+        """
+        def get(name):
+            scales_name = f'{prefix}{name}_scales'
+            return _dequantize(arrays[prefix + name], arrays[scales_name] if scales_name in arrays else None)
+
+        precision = str(arrays[f'{prefix}precision']) if f'{prefix}precision' in arrays else 'float32'
+        layers = len([name for name in arrays if name.startswith(prefix) and name.endswith('_recurrent_kernel')])
+        lstm_weights = [
+            (get(f'lstm_{i}_kernel'), get(f'lstm_{i}_recurrent_kernel'), arrays[f'{prefix}lstm_{i}_bias'])
+            for i in range(layers)
+        ]
+        return cls(lstm_weights, (get('dense_kernel'), arrays[f'{prefix}dense_bias']), precision=precision)
+
+    def save(self, path):
+        """
+        Save the weights to an .npz file at the engine's precision
+
+        Args:
+            path (str): Destination file
+        """
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an engine saved with save()
+
+        Args:
+            path (str): Source file
+
+        Returns:
+            NumpyLSTMEngine: Loaded engine
+        """
+        with np.load(path) as arrays:
+            return cls.from_arrays({name: arrays[name] for name in arrays.files})
+
+    def _allocate_buffers(self, batch, steps):
+        """Gate and state buffers of every layer for a batch shape"""
+        return [
+            {
+                'projected': np.empty((batch, steps, 4 * units), dtype=np.float32),
+                'gates': np.empty((batch, 4 * units), dtype=np.float32),
+                'h': np.empty((batch, units), dtype=np.float32),
+                'c': np.empty((batch, units), dtype=np.float32),
+                'tmp': np.empty((batch, units), dtype=np.float32),
+                'sequence': np.empty((batch, steps, units), dtype=np.float32),
+            }
+            for units in self.units
+        ]
+
+    def _get_buffers(self, batch, steps):
+        """Preallocated buffers for a small batch shape, reused across calls; caller holds the lock"""
+        key = (batch, steps)
+        if key not in self._buffers:
+            # Shapes come from a handful of lookbacks and batch sizes; start over if that ever changes
+            if len(self._buffers) >= 8:
+                self._buffers.clear()
+            self._buffers[key] = self._allocate_buffers(batch, steps)
+        return self._buffers[key]
+
+    def predict(self, x):
+        """
+        Run the forward pass
+
+        Safe to call from several threads at once: small batches share cached
+        buffers under a lock, larger ones allocate their own.
+
+        Args:
+            x (ndarray): Inputs of shape (batch, time steps, features)
+
+        Returns:
+            ndarray: Outputs of shape (batch, output units)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        batch, steps, _ = x.shape
+        if batch > self.max_cached_batch:
+            return self._forward(x, self._allocate_buffers(batch, steps))
+        with self._buffers_lock:
+            return self._forward(x, self._get_buffers(batch, steps))
+
+    def _forward(self, x, buffers):
+        """Forward pass through the LSTM stack and output layer using the given buffers"""
+        steps = x.shape[1]
+        layer_input = x
+        for (kernel, recurrent_kernel, bias), units, buf in zip(self.lstm_weights, self.units, buffers):
+            # Input projections for every time step in one matmul
+            projected = buf['projected']
+            np.matmul(layer_input, kernel, out=projected)
+            projected += bias
+
+            gates, h, c, tmp, sequence = buf['gates'], buf['h'], buf['c'], buf['tmp'], buf['sequence']
+            h.fill(0.0)
+            c.fill(0.0)
+            for t in range(steps):
+                np.matmul(h, recurrent_kernel, out=gates)
+                gates += projected[:, t]
+
+                input_gate = _sigmoid(gates[:, :units], gates[:, :units])
+                forget_gate = _sigmoid(gates[:, units:2 * units], gates[:, units:2 * units])
+                candidate = np.tanh(gates[:, 2 * units:3 * units], out=gates[:, 2 * units:3 * units])
+                output_gate = _sigmoid(gates[:, 3 * units:], gates[:, 3 * units:])
+
+                # c = f * c + i * g; h = o * tanh(c)
+                c *= forget_gate
+                np.multiply(input_gate, candidate, out=tmp)
+                c += tmp
+                np.tanh(c, out=h)
+                h *= output_gate
+                sequence[:, t] = h
+
+            layer_input = sequence
+
+        kernel, bias = self.dense_weights
+        return layer_input[:, -1] @ kernel + bias
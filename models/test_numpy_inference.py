@@ -0,0 +1,141 @@
+"""
+Parity test for the Oasis NumPy inference engine
+Checks that the engine reproduces Keras outputs for the LSTM predictor's model
+"""
+import sys
+import os
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Add the models directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.lstm_predictor import LSTMPredictor
+from models.numpy_inference import NumpyLSTMEngine
+
+def test_engine_parity(lookback_days=60, batch_size=16, tolerance=1e-5):
+    """Compare engine and Keras outputs on random windows"""
+    print("Testing NumPy engine parity with Keras")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = LSTMPredictor('TEST', period='1y', model_dir=model_dir)
+        model = predictor.build_model(lookback_days)
+
+        # Perturb the initial weights so every gate contributes
+        rng = np.random.default_rng(0)
+        model.set_weights([w + rng.normal(0, 0.1, w.shape).astype(np.float32) for w in model.get_weights()])
+
+        engine = NumpyLSTMEngine.from_keras(model)
+        path = os.path.join(model_dir, 'engine.npz')
+        engine.save(path)
+        loaded = NumpyLSTMEngine.load(path)
+
+        for batch in (1, batch_size):
+            windows = rng.random((batch, lookback_days, 1), dtype=np.float32)
+            expected = model.predict(windows, verbose=0)
+
+            for name, candidate in (('exported', engine), ('loaded', loaded)):
+                actual = candidate.predict(windows)
+                max_error = float(np.max(np.abs(actual - expected)))
+                print(f"batch {batch:>3} {name:>8} engine: max abs error {max_error:.2e}")
+                assert actual.shape == expected.shape
+                assert max_error < tolerance, f"Engine output differs from Keras by {max_error}"
+
+    print("Parity test passed")
+
+def test_quantized_artifacts(lookback_days=60, batch_size=64):
+    """Compare artifact size, load time and output error per precision"""
+    print("\n\nTesting quantized engine artifacts")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = LSTMPredictor('TEST', period='1y', model_dir=model_dir)
+        model = predictor.build_model(lookback_days)
+        engine = NumpyLSTMEngine.from_keras(model)
+        windows = np.random.default_rng(0).random((batch_size, lookback_days, 1), dtype=np.float32)
+        expected = engine.predict(windows)
+
+        print(f"{'precision':>10} {'size':>10} {'load time':>10} {'max abs error':>14}")
+        for precision in ('float32', 'float16', 'int8'):
+            path = os.path.join(model_dir, f'engine_{precision}.npz')
+            engine.quantize(precision).save(path)
+
+            start = time.perf_counter()
+            loaded = NumpyLSTMEngine.load(path)
+            load_time = time.perf_counter() - start
+
+            # The saved artifact must predict exactly what quantize() does in memory
+            assert loaded.precision == precision
+            assert np.array_equal(loaded.predict(windows), engine.quantize(precision).predict(windows))
+
+            max_error = float(np.max(np.abs(loaded.predict(windows) - expected)))
+            print(f"{precision:>10} {os.path.getsize(path) / 1024:>8.1f}KB {load_time * 1000:>8.2f}ms {max_error:>14.2e}")
+            assert max_error < 0.05, f"{precision} engine output differs by {max_error}"
+
+def test_single_window_latency(lookback_days=60, runs=200):
+    """Compare per-call latency for a single (1, lookback_days, 1) window"""
+    print("\n\nTesting single-window prediction latency")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = LSTMPredictor('TEST', period='1y', model_dir=model_dir)
+        model = predictor.build_model(lookback_days)
+        engine = NumpyLSTMEngine.from_keras(model)
+        window = np.random.default_rng(0).random((1, lookback_days, 1), dtype=np.float32)
+
+        # Warm up both paths
+        model.predict(window, verbose=0)
+        engine.predict(window)
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            model.predict(window, verbose=0)
+        keras_time = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            engine.predict(window)
+        engine_time = (time.perf_counter() - start) / runs
+
+        print(f"Keras model.predict: {keras_time * 1000:.2f}ms per call")
+        print(f"NumPy engine:        {engine_time * 1000:.2f}ms per call")
+        print(f"Speedup:             {keras_time / engine_time:.1f}x")
+
+def test_concurrent_predictions(lookback_days=60, threads=8, calls=300):
+    """Check that threads sharing one engine, as API requests do, get their own outputs"""
+    print("\n\nTesting concurrent predictions on one engine")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = LSTMPredictor('TEST', period='1y', model_dir=model_dir)
+        engine = NumpyLSTMEngine.from_keras(predictor.build_model(lookback_days))
+
+        # Single windows use the cached buffers, the large batch allocates its own
+        rng = np.random.default_rng(0)
+        inputs = [rng.random((batch, lookback_days, 1), dtype=np.float32)
+                  for batch in (1, 1, 4, engine.max_cached_batch + 1)]
+        expected = [engine.predict(x) for x in inputs]
+
+        def worker(seed):
+            mismatches = 0
+            for i in range(calls):
+                k = (seed + i) % len(inputs)
+                mismatches += not np.array_equal(engine.predict(inputs[k]), expected[k])
+            return mismatches
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            mismatches = sum(executor.map(worker, range(threads)))
+
+        print(f"{threads} threads x {calls} calls: {mismatches} wrong outputs")
+        print(f"Engine memory: {engine.nbytes / 1024:.1f}KB")
+        assert mismatches == 0, f"{mismatches} predictions were corrupted by concurrent calls"
+        assert not any(key[0] > engine.max_cached_batch for key in engine._buffers)
+
+if __name__ == "__main__":
+    test_engine_parity()
+    test_quantized_artifacts()
+    test_single_window_latency()
+    test_concurrent_predictions()
@@ -0,0 +1,96 @@
+"""
+Training callbacks for Oasis models
+Stop training once it stops paying off or runs out of its time budget
+"""
+import os
+import time
+import logging
+# pylint: disable=import-error
+from tensorflow.keras.callbacks import Callback, EarlyStopping
+# pylint: enable=import-error
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class TimeBudget(Callback):
+    """Stop training as soon as a wall-clock budget runs out, in the middle of an epoch if need be"""
+
+    def __init__(self, seconds):
+        """
+        Initialize the callback
+
+        Args:
+            seconds (float): Wall-clock budget for the whole fit() call
+        """
+        super().__init__()
+        self.seconds = seconds
+        self.started_at = None
+        self.exhausted = False
+
+    def on_train_begin(self, logs=None):
+        self.started_at = time.monotonic()
+        self.exhausted = False
+
+    def _check(self, where):
+        """Stop training if the budget is used up"""
+        if self.exhausted or time.monotonic() - self.started_at < self.seconds:
+            return
+        logger.info(f"Training time budget of {self.seconds:.0f}s used {where}")
+        self.exhausted = True
+        self.model.stop_training = True
+
+    def on_train_batch_end(self, batch, logs=None):
+        # A single epoch over a long history can outlast the budget on its own
+        self._check(f"at batch {batch + 1}")
+
+    def on_epoch_end(self, epoch, logs=None):
+        self._check(f"after {epoch + 1} epochs")
+
+
+def training_callbacks(validation=True, early_stopping=True, patience=None, time_budget=None):
+    """
+    Build the callbacks used for a training job
+
+    Early stopping watches the validation loss when a holdout is used and the
+    training loss otherwise, and restores the weights of the best epoch.
+
+    Args:
+        validation (bool): Whether fit() gets validation data
+        early_stopping (bool): Whether to stop once the monitored loss stops improving
+        patience (int): Epochs without improvement before stopping
+        time_budget (float): Wall-clock budget in seconds; 0 disables it
+
+    Returns:
+        list: Keras callbacks
+    """
+    patience = patience or int(os.getenv('EARLY_STOPPING_PATIENCE', 5))
+    time_budget = time_budget if time_budget is not None else float(os.getenv('TRAINING_TIME_BUDGET_SECONDS', 0))
+
+    callbacks = []
+    if early_stopping:
+        callbacks.append(EarlyStopping(
+            monitor='val_loss' if validation else 'loss',
+            patience=patience,
+            restore_best_weights=True
+        ))
+    if time_budget > 0:
+        callbacks.append(TimeBudget(time_budget))
+    return callbacks
+
+
+def epoch_budget(epochs):
+    """
+    Cap a requested epoch count at TRAINING_MAX_EPOCHS
+
+    Args:
+        epochs (int): Requested number of epochs
+
+    Returns:
+        int: Number of epochs to run
+    """
+    max_epochs = int(os.getenv('TRAINING_MAX_EPOCHS', 0))
+    return min(epochs, max_epochs) if max_epochs > 0 else epochs
@@ -19,6 +19,22 @@ def test_root_endpoint():
         print(f"Error testing root endpoint: {e}")
         return False
 
+def wait_for_job(job_id, timeout=600):
+    """Poll a background training job until it finishes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{BASE_URL}/jobs/{job_id}")
+        if response.status_code != 200:
+            print(f"Job {job_id} lookup failed: {response.status_code} {response.text}")
+            return False
+        job = response.json()
+        if job['status'] in ('completed', 'failed'):
+            print(f"Job {job_id} {job['status']}")
+            return job['status'] == 'completed'
+        time.sleep(2)
+    print(f"Job {job_id} timed out")
+    return False
+
 def test_predict_endpoint():
     """Test the predict endpoint"""
     print("\nTesting predict endpoint...")
@@ -31,6 +47,12 @@ def test_predict_endpoint():
         }
         response = requests.post(f"{BASE_URL}/predict", json=payload)
         print(f"Predict endpoint status: {response.status_code}")
+        if response.status_code == 202:
+            # Untrained symbol: wait for the training job, then ask again
+            if not wait_for_job(response.json()['job_id']):
+                return False
+            response = requests.post(f"{BASE_URL}/predict", json=payload)
+            print(f"Predict endpoint status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
             print(f"Predicted price: ${data['predicted_price']:.2f}")
@@ -77,10 +99,10 @@ def test_update_model_endpoint():
         }
         response = requests.post(f"{BASE_URL}/update_model", params=params)
         print(f"Update model endpoint status: {response.status_code}")
-        if response.status_code == 200:
+        if response.status_code == 202:
             data = response.json()
             print(f"Update message: {data['message']}")
-            return True
+            return wait_for_job(data['job_id'])
         else:
             print(f"Error response: {response.text}")
             return False